@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Auto CRS
+Description          : Local projected CRS(UTM zone) for measure of feature
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+from collections import OrderedDict
+
+from qgis.core import (
+    QgsPointXY,
+    QgsDistanceArea,
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform
+)
+
+
+def zoneEpsg(lon, lat):
+    """
+    EPSG of UTM zone, or UPS for polar regions
+    """
+    if lat > 84:
+        return 32661
+    if lat < -80:
+        return 32761
+
+    zone = min( max( int( ( lon + 180 ) / 6 ) + 1, 1 ), 60 )
+    return ( 32600 if lat >= 0 else 32700 ) + zone
+
+
+class AutoMeasureCrs():
+    """
+    Bounded cache(last used) of QgsCoordinateTransform by source CRS and zone.
+    Not thread safe, use one instance by thread.
+    unitMeasure: QgsDistanceArea for conversion of units, all zones are in meters
+    """
+    def __init__(self, transformContext, maxZones=16):
+        self.transformContext = transformContext
+        self.maxZones = maxZones
+        self.crsWgs84 = QgsCoordinateReferenceSystem('EPSG:4326')
+        self.toWgs84 = OrderedDict() # Source CRS: QgsCoordinateTransform
+        self.zones = OrderedDict() # ( Source CRS, EPSG ): QgsCoordinateTransform
+        self.unitMeasure = QgsDistanceArea()
+        self.unitMeasure.setSourceCrs( QgsCoordinateReferenceSystem('EPSG:32601'), transformContext )
+
+    def get(self, sourceCrs, point):
+        """
+        point: QgsPointXY in sourceCrs
+        Return QgsCoordinateTransform, read only
+        """
+        keyCrs = sourceCrs.authid() or sourceCrs.toWkt()
+        lonLat = self._wgs84( keyCrs, sourceCrs ).transform( point )
+        key = ( keyCrs, zoneEpsg( lonLat.x(), lonLat.y() ) )
+        if key in self.zones:
+            self.zones.move_to_end( key )
+            return self.zones[ key ]
+
+        crs = QgsCoordinateReferenceSystem( f"EPSG:{key[1]}" )
+        self.zones[ key ] = QgsCoordinateTransform( sourceCrs, crs, self.transformContext )
+        if len( self.zones ) > self.maxZones:
+            self.zones.popitem( last=False )
+        return self.zones[ key ]
+
+    def getByGeometry(self, sourceCrs, geometry):
+        """
+        Zone of first vertex
+        """
+        return self.get( sourceCrs, QgsPointXY( geometry.vertexAt(0) ) )
+
+    def _wgs84(self, keyCrs, sourceCrs):
+        if keyCrs in self.toWgs84:
+            self.toWgs84.move_to_end( keyCrs )
+            return self.toWgs84[ keyCrs ]
+
+        ct = QgsCoordinateTransform( sourceCrs, self.crsWgs84, self.transformContext )
+        self.toWgs84[ keyCrs ] = ct
+        if len( self.toWgs84 ) > self.maxZones:
+            self.toWgs84.popitem( last=False )
+        return ct
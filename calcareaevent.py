@@ -25,17 +25,22 @@ __copyright__ = '(C) 2021, Luiz Motta'
 __revision__ = '$Format:%H$'
 
 
+import math
+
 from qgis.PyQt.QtCore import (
     Qt,
     QObject,
     QEvent,
     QPointF,
+    QTimer,
     pyqtSlot, pyqtSignal
 )
 from qgis.PyQt.QtGui import QFont, QTextDocument
 
 from qgis.core import (
-    QgsGeometry,
+    QgsApplication, QgsTask,
+    QgsPointXY, QgsGeometry, QgsLineString,
+    QgsFeatureRequest, QgsVectorLayerFeatureSource,
     QgsMapLayerType, QgsWkbTypes,
     QgsDistanceArea,
     QgsUnitTypes,
@@ -45,38 +50,61 @@ from qgis.core import (
 )
 from qgis.gui import QgsMapTool
 
+from .segmentindex import SegmentGrid, segmentsIntersect
+from .autocrs import AutoMeasureCrs
+from .lodmeasure import LodMeasureTask
+
+
+FID_NULL = -2**63 # Same of QGIS, feature not added in layer
+
 
 class AnnotationCanvas(QObject):
     def __init__(self):
         super().__init__()
         self.annotationManager = QgsProject.instance().annotationManager()
         self.annotationManager.annotationAboutToBeRemoved.connect( self.annotationAboutToBeRemoved )
+        # Reused by setText
+        font = QFont()
+        font.setPointSize(12)
+        font.setBold( True )
+        self.document = QTextDocument()
+        self.document.setDefaultFont( font )
+        self.frameOffset = QPointF(0,0)
+        self.text = None # Text of document
+        self.isAdded = False # In annotationManager
 
         self._create() # Create self.annot
 
     def setText(self, text, pointXY):
-        def setFrameDocument():
-            font = QFont()
-            font.setPointSize(12)
-            font.setBold( True )
-            td = QTextDocument( text )
-            td.setDefaultFont( font )
-            self.annot.setFrameOffsetFromReferencePointMm( QPointF(0,0) )
-            self.annot.setFrameSize( td.size() )
-            self.annot.setDocument( td )
-
-        if not self.annot in self.annotationManager.annotations():
+        if not self.isAdded:
             self._create()
             self.annotationManager.addAnnotation( self.annot )
-        
+            self.isAdded = True
+            self.text = None
+
         self.annot.setMapPosition( pointXY )
-        setFrameDocument()
+        if not text == self.text: # Annotation copy the document
+            self.document.setPlainText( text )
+            self.annot.setFrameOffsetFromReferencePointMm( self.frameOffset )
+            self.annot.setFrameSize( self.document.size() )
+            self.annot.setDocument( self.document )
+            self.text = text
         self.annot.setVisible( True )
 
+    def setPosition(self, pointXY):
+        if not self.annot is None:
+            self.annot.setMapPosition( pointXY )
+
     def remove(self):
         if self.annot:
-            self.annotationManager.removeAnnotation( self.annot )
+            if self.isAdded:
+                self.annotationManager.removeAnnotation( self.annot )
             self.annot = None
+        self.isAdded = False
+
+    def release(self):
+        self.remove()
+        self.annotationManager.annotationAboutToBeRemoved.disconnect( self.annotationAboutToBeRemoved )
 
     def isVisible(self):
         if self.annot is None:
@@ -95,6 +123,7 @@ class AnnotationCanvas(QObject):
     def annotationAboutToBeRemoved(self, annot):
         if annot == self.annot:
             self.annot = None
+            self.isAdded = False
 
     def _create(self):
         annot = QgsTextAnnotation()
@@ -123,27 +152,114 @@ class AnnotationCanvas(QObject):
         self.annot = annot
 
 
+class MeasurePublisher(QObject):
+    """
+    Live values are coalesced by layer and feature, emitted at most each 'interval' milliseconds.
+    Final values are emitted immediately, discarding pending live value of feature.
+    """
+    measured = pyqtSignal(str, 'qint64', float, float, str, str, str, bool)
+    def __init__(self, source=None, interval=100):
+        """
+        source: QObject with the public 'measured' signal, connected to self.measured
+        """
+        super().__init__()
+        self.source = self if source is None else source
+        self.pending = {} # ( layerId, fid ): args of measured
+        self.timer = QTimer()
+        self.timer.setSingleShot( True )
+        self.timer.setInterval( interval )
+        self.timer.timeout.connect( self.flush )
+
+    def publish(self, layerId, fid, area, perimeter, areaUnit, lengthUnit, crs, isFinal):
+        args = ( layerId, fid, area, perimeter, areaUnit, lengthUnit, crs, isFinal )
+        if isFinal:
+            self.pending.pop( ( layerId, fid ), None )
+            self.measured.emit( *args )
+            return
+
+        self.pending[ ( layerId, fid ) ] = args
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def isListened(self):
+        return self.source.receivers( self.source.measured ) > 0
+
+    def stop(self):
+        self.timer.stop()
+        self.pending.clear()
+
+    @pyqtSlot()
+    def flush(self):
+        pending, self.pending = self.pending, {}
+        for args in pending.values():
+            self.measured.emit( *args )
+
+
+class LabelAnchorTask(QgsTask):
+    """
+    Pole of inaccessibility of polygon, the visual center for label.
+    Result: pointXY(map CRS) or None
+    """
+    anchored = pyqtSignal(int, object)
+    def __init__(self, jobId, geometry, tolerance, ctMeasure2Map):
+        super().__init__( 'CalcArea2 label anchor', QgsTask.CanCancel )
+        self.jobId = jobId
+        self.geometry = geometry # Copy, measure CRS
+        self.tolerance = tolerance
+        self.ctMeasure2Map = QgsCoordinateTransform( ctMeasure2Map )
+        self.point = None
+
+    def run(self):
+        geom = self.geometry.poleOfInaccessibility( self.tolerance )[0]
+        if self.isCanceled() or geom.isNull():
+            return False
+        self.point = self.ctMeasure2Map.transform( geom.asPoint() )
+        return True
+
+    def finished(self, result):
+        self.anchored.emit( self.jobId, self.point if result else None )
+
+
 class BasePolygonEvent(QObject):
+    anchorPixels = 2 # Tolerance of label anchor
     def __init__(self, mapCanvas):
         super().__init__()
         self.mapCanvas = mapCanvas
         self.crs_unit = {
             'crs': QgsCoordinateReferenceSystem('EPSG:3857'),
             'area': QgsUnitTypes.AreaHectares,
-            'length': QgsUnitTypes.DistanceMeters
+            'length': QgsUnitTypes.DistanceMeters,
+            'auto': False # Local projected CRS by feature
         }
         self.annotationCanvas = AnnotationCanvas()
         self.project =  QgsProject.instance()
+        self.autoCrs = AutoMeasureCrs( self.project.transformContext() )
+        self.autoCrsWorker = None # self.workerAutoCrs
+        self.publisher = None # MeasurePublisher, set by CalcAreaEvent
         self.project.crsChanged.connect( self.crsChanged )
         self.measure = QgsDistanceArea()
         self.measure.setSourceCrs( self.crs_unit['crs'], self.project.transformContext() )
         self.ctProject2Measure = QgsCoordinateTransform( self.project.crs(), self.crs_unit['crs'], self.project )
         self.isEnabled = False # Annotation
         self.isEventFiltered = False
+        self.unitLabels = None # self._updateUnitLabels
+        self.unitCodes = None
+        self._updateUnitLabels()
+        self.anchorJob = 0
+        self.anchorTasks = set() # Running, keep the references
 
         self.objsToggleFilter = None # Need set by child class, Ex.:  ( mapCanvas, # Keyboard,  mapCanvas.viewport() # Mouse )
-
-    def __del__(self):
+        self.eventHandlers = {} # Need set by child class, Ex.: { QEvent.MouseMove: self._mouseMove }
+
+    def release(self):
+        """
+        Disconnect signals and remove event filters, called when the plugin is unloaded
+        """
+        if self.isEnabled:
+            self.disable()
+        self.setEventFilter( False )
+        self._stopAnchor()
+        self.annotationCanvas.release()
         self.project.crsChanged.disconnect( self.crsChanged )
 
     def setCrsUnit(self, crs_unit):
@@ -151,47 +267,135 @@ class BasePolygonEvent(QObject):
             self.crs_unit[ k ] = crs_unit[ k ]
         self.measure.setSourceCrs( self.crs_unit['crs'], self.project.transformContext() )
         self.ctProject2Measure.setDestinationCrs( self.crs_unit['crs'] )
+        self._updateUnitLabels()
 
     def enable(self):
         self.isEnabled = True
 
     def disable(self):
-        self.annotationCanvas.remove()
+        self.removeAnnotation()
         self.isEnabled = False
 
-    def toggleEventFilter(self):
-        def toggle(obj):
-            f = obj.removeEventFilter if self.isEventFiltered else obj.installEventFilter
-            f( self )
-
-        if self.objsToggleFilter is None:
+    def setEventFilter(self, enabled):
+        if self.objsToggleFilter is None or enabled == self.isEventFiltered:
             return
 
         for obj in self.objsToggleFilter:
-            toggle( obj )
+            if enabled:
+                obj.installEventFilter( self )
+            else:
+                obj.removeEventFilter( self )
 
-        self.isEventFiltered = not self.isEventFiltered
+        self.isEventFiltered = enabled
 
-    def stringMeasures(self, geometry):
-        def createString(length, area):
-            def getString(value, unit, f_measure):
-                value_ = round( f_measure( value, unit  ), 2 )
-                unit_ = QgsUnitTypes.toAbbreviatedString( unit )
-                return f"{value_} {unit_}"
+    @staticmethod
+    def isPolygonLayer(layer):
+        return \
+            False if \
+                layer is None or \
+                not layer.type() == QgsMapLayerType.VectorLayer or \
+                not layer.geometryType() == QgsWkbTypes.PolygonGeometry \
+        else True
+
+    def removeAnnotation(self):
+        self._stopAnchor()
+        self.annotationCanvas.remove()
+
+    def anchorLabel(self, geometry, crs):
+        """
+        Move the annotation, showed in provisional point, to the pole of inaccessibility computed in a task
+        geometry: Polygon in crs(measure)
+        """
+        self._stopAnchor()
+        if geometry.isEmpty():
+            return
 
-            s_lenght = getString( length, self.crs_unit['length'], self.measure.convertLengthMeasurement )
-            s_area = getString( area, self.crs_unit['area'], self.measure.convertAreaMeasurement )
+        # Tolerance of pixels in canvas scale
+        meters = self.anchorPixels * self.mapCanvas.scale() * 0.0254 / self.mapCanvas.mapSettings().outputDpi()
+        tolerance = meters * QgsUnitTypes.fromUnitToUnitFactor( QgsUnitTypes.DistanceMeters, crs.mapUnits() )
+        ct = QgsCoordinateTransform( crs, self.project.crs(), self.project )
+        task = LabelAnchorTask( self.anchorJob, QgsGeometry( geometry ), tolerance, ct )
+        task.anchored.connect( self.anchored )
+        self.anchorTasks.add( task )
+        QgsApplication.taskManager().addTask( task )
+
+    @pyqtSlot(int, object)
+    def anchored(self, jobId, pointXY):
+        self.anchorTasks.discard( self.sender() )
+        if not jobId == self.anchorJob or pointXY is None or not self.annotationCanvas.isAdded:
+            return
+
+        self.annotationCanvas.setPosition( pointXY )
+
+    def _stopAnchor(self):
+        self.anchorJob += 1 # Stale running tasks
+        for task in self.anchorTasks:
+            task.cancel()
+
+    def workerAutoCrs(self):
+        """
+        AutoMeasureCrs of the single running worker of event, reused by the next ones
+        Return None when not is automatic CRS
+        """
+        if not self.crs_unit['auto']:
+            return None
+
+        if self.autoCrsWorker is None:
+            self.autoCrsWorker = AutoMeasureCrs( self.project.transformContext() )
+        return self.autoCrsWorker
+
+    def unitMeasure(self):
+        return self.autoCrs.unitMeasure if self.crs_unit['auto'] else self.measure
+
+    def transformMeasure(self, sourceCrs, geometry, ct):
+        """
+        ct: Transform to CRS of setup, used when not is automatic CRS
+        """
+        if not self.crs_unit['auto'] or geometry.isEmpty():
+            return ct
+
+        return self.autoCrs.getByGeometry( sourceCrs, geometry )
+
+    def publish(self, layer, fid, area, length, crs, isFinal):
+        """
+        area, length: Values in units of measure CRS
+        """
+        # Mouse move path: nothing is built without listeners
+        if self.publisher is None or layer is None or not self.publisher.isListened():
+            return
+
+        f_area, _s_area, f_length, _s_length = self.unitLabels
+        e_area, e_length = self.unitCodes
+        self.publisher.publish( layer.id(), fid, area * f_area, length * f_length, e_area, e_length, crs.authid(), isFinal )
+
+    def stringMeasures(self, geometry):
+        return self.stringValues( geometry.area(), geometry.length() )
 
-            return f"Area: {s_area}\nPerimeter: {s_lenght}"
+    def stringValues(self, area, length):
+        """
+        area, length: Values in units of measure CRS
+        """
+        f_area, s_area, f_length, s_length = self.unitLabels
+        return f"Area: {round( area * f_area, 2 )} {s_area}\nPerimeter: {round( length * f_length, 2 )} {s_length}"
 
+    def _updateUnitLabels(self):
+        # Factors of conversion and abbreviations, the conversions are linear
         if not isinstance( self.crs_unit['area'], QgsUnitTypes.AreaUnit ):
             raise TypeError(f"Unit measure '{QgsUnitTypes.toAbbreviatedString( self.crs_unit['area'] )}' not implemeted")
         if not isinstance( self.crs_unit['length'], QgsUnitTypes.DistanceUnit ):
             raise TypeError(f"Unit measure '{QgsUnitTypes.toAbbreviatedString( self.crs_unit['length'] )}' not implemeted")
 
-        length = geometry.length()
-        area = geometry.area()
-        return createString( length, area )
+        measure = self.unitMeasure()
+        self.unitLabels = (
+            measure.convertAreaMeasurement( 1.0, self.crs_unit['area'] ),
+            QgsUnitTypes.toAbbreviatedString( self.crs_unit['area'] ),
+            measure.convertLengthMeasurement( 1.0, self.crs_unit['length'] ),
+            QgsUnitTypes.toAbbreviatedString( self.crs_unit['length'] )
+        )
+        self.unitCodes = (
+            QgsUnitTypes.encodeUnit( self.crs_unit['area'] ),
+            QgsUnitTypes.encodeUnit( self.crs_unit['length'] )
+        )
 
     @pyqtSlot()
     def crsChanged(self):
@@ -199,7 +403,12 @@ class BasePolygonEvent(QObject):
 
     @pyqtSlot(QObject, QEvent)
     def eventFilter(self, watched, event):
-        pass # Virtual
+        # Installed only while measuring, the lookup avoids any allocation for other events
+        handler = self.eventHandlers.get( event.type() )
+        if not handler is None:
+            handler( event )
+
+        return False
 
 
 class AddFeatureEvent(BasePolygonEvent):
@@ -211,88 +420,105 @@ class AddFeatureEvent(BasePolygonEvent):
             mapCanvas.viewport() # Mouse
         ]
         self.geomPolygon = self.GeomPolygon( iface )
+        self.ctFeature = self.ctProject2Measure # Automatic CRS, defined by first point
+        self.mapToPixel = mapCanvas.getCoordinateTransform() # Owned by canvas, updated with extent
         self.movePoint = None
         self.isValidLayer = False
+        self.labelInvalid = 'Invalid: self-intersection'
+        # Dispatch tables
+        self.eventHandlers = {
+            QEvent.MouseMove: self._mouseMove,
+            QEvent.MouseButtonRelease: self._mouseRelease,
+            QEvent.KeyRelease: self._keyRelease
+        }
+        self.buttonHandlers = {
+            Qt.LeftButton: self._leftRelease,
+            Qt.RightButton: self._rightRelease
+        }
+        self.keyHandlers = {
+            Qt.Key_Escape: self._keyEscape,
+            Qt.Key_Delete: self._keyDelete
+        }
 
-    def __del__(self):
-        super().__del__()
-        del self.geomPolygon
-
-    @pyqtSlot(QObject, QEvent)
-    def eventFilter(self, watched, event):
-        def xyCursor():
-            x_ = event.localPos().x()
-            y_ = event.localPos().y()
-            return self.mapCanvas.getCoordinateTransform().toMapCoordinates( x_, y_)
-
-        def showMeasure():
-            geom = self.geomPolygon.geometry( self.ctProject2Measure.transform( self.movePoint ) )
-            label = self.stringMeasures( geom )
-            self.annotationCanvas.setText( label, self.movePoint )
-
-        def event_mouse_move():
-            if not self.isValidLayer or not self.isEnabled:
-                return
-
-            if self.geomPolygon.count() < 2:
-                self.annotationCanvas.remove()
-                return
-
-            self.movePoint = xyCursor()
-            showMeasure()
+    def release(self):
+        super().release()
+        self.geomPolygon.release()
+
+    def _xyCursor(self, event):
+        pos = event.localPos()
+        return self.mapToPixel.toMapCoordinates( pos.x(), pos.y() )
+
+    def _showMeasure(self):
+        point = self.ctFeature.transform( self.movePoint )
+        measures = self.geomPolygon.measures( point )
+        if measures is None: # Curves
+            geom = self.geomPolygon.geometry( point )
+            measures = ( geom.area(), geom.length() )
+        area, length = measures
+        label = self.stringValues( area, length )
+        if not self.geomPolygon.isValid( point ):
+            label = f"{label}\n{self.labelInvalid}"
+        self.annotationCanvas.setText( label, self.movePoint )
+        self.publish( self.mapCanvas.currentLayer(), FID_NULL, area, length, self.ctFeature.destinationCrs(), False )
+
+    def _mouseMove(self, event):
+        if not self.isValidLayer or not self.isEnabled:
+            return
 
-        def event_mouse_release():
-            def leftPress():
-                self.geomPolygon.add( self.ctProject2Measure.transform( xyCursor() ) )
+        if self.geomPolygon.count() < 2:
+            self.removeAnnotation()
+            return
 
-            def rightPress():
-                if self.isEnabled and self.geomPolygon.count() > 2:
-                    if self.geomPolygon.isMiddlePoint():
-                        self.geomPolygon.pop()
-                    xyPoint = self.ctProject2Measure.transform( self.geomPolygon.coordinate(-1), QgsCoordinateTransform.ReverseTransform )
-                    label = self.stringMeasures( self.geomPolygon.geometry() )
-                    self.annotationCanvas.setText( label, xyPoint )
-                self.geomPolygon.clear()
+        self.movePoint = self._xyCursor( event )
+        self._showMeasure()
 
-            if not self.isValidLayer:
-                return
+    def _mouseRelease(self, event):
+        if not self.isValidLayer:
+            return
 
-            k = event.button()
-            d = {
-                Qt.LeftButton: leftPress,
-                Qt.RightButton: rightPress
-            }
-            if k in d:
-                d[ k ]()
-
-        def event_key_release():
-            def key_escape():
-                self.geomPolygon.clear()
-                self.annotationCanvas.remove()
-
-            def key_delete():
-                if self.geomPolygon.count() > 1:
-                    self.geomPolygon.pop(True)
-                    self.annotationCanvas.remove()
-
-            k = event.key()
-            d = {
-                Qt.Key_Escape: key_escape,
-                Qt.Key_Delete: key_delete
-            }
-            if k in d:
-                d[ k ]()
-
-        e_type = event.type()
-        d = {
-            QEvent.MouseMove: event_mouse_move,
-            QEvent.MouseButtonRelease: event_mouse_release,
-            QEvent.KeyRelease: event_key_release
-        }
-        if e_type in d:
-            d[ e_type ]()
-        
-        return False
+        handler = self.buttonHandlers.get( event.button() )
+        if not handler is None:
+            handler( event )
+
+    def _leftRelease(self, event):
+        point = self._xyCursor( event )
+        if not self.geomPolygon.count():
+            self.ctFeature = self.ctProject2Measure
+            if self.crs_unit['auto']:
+                self.ctFeature = self.autoCrs.get( self.project.crs(), point )
+        self.geomPolygon.add( self.ctFeature.transform( point ) )
+
+    def _rightRelease(self, event):
+        if self.isEnabled and self.geomPolygon.count() > 2:
+            if self.geomPolygon.isMiddlePoint():
+                self.geomPolygon.pop()
+            xyPoint = self.ctFeature.transform( self.geomPolygon.coordinate(-1), QgsCoordinateTransform.ReverseTransform )
+            geom = self.geomPolygon.geometry()
+            measures = self.geomPolygon.measures()
+            if measures is None: # Curves
+                measures = ( geom.area(), geom.length() )
+            area, length = measures
+            label = self.stringValues( area, length )
+            if not self.geomPolygon.isValid():
+                label = f"{label}\n{self.labelInvalid}"
+            self.annotationCanvas.setText( label, xyPoint )
+            self.anchorLabel( geom, self.ctFeature.destinationCrs() )
+            self.publish( self.mapCanvas.currentLayer(), FID_NULL, area, length, self.ctFeature.destinationCrs(), True )
+        self.geomPolygon.clear()
+
+    def _keyRelease(self, event):
+        handler = self.keyHandlers.get( event.key() )
+        if not handler is None:
+            handler( event )
+
+    def _keyEscape(self, event):
+        self.geomPolygon.clear()
+        self.removeAnnotation()
+
+    def _keyDelete(self, event):
+        if self.geomPolygon.count() > 1:
+            self.geomPolygon.pop(True)
+            self.removeAnnotation()
 
     class GeomPolygon(QObject):
         def __init__(self, iface):
@@ -312,11 +538,17 @@ class AddFeatureEvent(BasePolygonEvent):
             super().__init__()
             self.points = []
             self.idsMiddleCurve = []
+            self.segmentIndex = SegmentGrid() # Committed edges, id = id of start point
+            self.edgesCrossing = [] # Edge crossing a previous edge, by id
+            self.totalCrossing = 0
+            # Cumulative by edge, coordinates relative to first point
+            self.crossSums = [] # Shoelace
+            self.lengthSums = []
             self.isCurve = False
             self.actionDigitizeWithCurve = getActionDigitizeWithCurve( iface )
             self.actionDigitizeWithCurve.toggled.connect( self.toggledCurve )
 
-        def __del__(self):
+        def release(self):
             self.actionDigitizeWithCurve.toggled.disconnect( self.toggledCurve )
 
         def count(self):
@@ -342,9 +574,11 @@ class AddFeatureEvent(BasePolygonEvent):
             self.points.append( point )
             if self.isCurve:
                 populateIdCurves()
+            self._addEdge()
 
         def pop(self, key_delete=False):
             self.points.pop()
+            self._removeEdges()
             if not key_delete and self.isCurve:
                 self.idsMiddleCurve.pop()
                 return
@@ -357,6 +591,7 @@ class AddFeatureEvent(BasePolygonEvent):
             if idPoint == ( self.idsMiddleCurve[-1] ): # Middle
                 self.points.pop() # Start
                 self.idsMiddleCurve.pop()
+                self._removeEdges()
 
         def coordinate(self, position):
             return self.points[ position ]
@@ -364,6 +599,11 @@ class AddFeatureEvent(BasePolygonEvent):
         def clear(self):
             self.points.clear()
             self.idsMiddleCurve.clear()
+            self.segmentIndex.clear()
+            self.edgesCrossing.clear()
+            self.totalCrossing = 0
+            self.crossSums.clear()
+            self.lengthSums.clear()
 
         def isMiddlePoint(self):
             return self.isCurve and len( self.idsMiddleCurve ) > 1 and self.idsMiddleCurve[-1] == ( len(self.points)-1 )
@@ -409,75 +649,614 @@ class AddFeatureEvent(BasePolygonEvent):
 
             return getCurvePolygon( points )
 
+        def measures(self, movePoint=None):
+            """
+            Area and perimeter of linear ring from the sums of committed edges, without geometry.
+            Return None for ring with curves.
+            """
+            if len( self.idsMiddleCurve ):
+                return None
+
+            if not len( self.points ):
+                return ( 0.0, 0.0 )
+
+            x0, y0 = self.points[0].x(), self.points[0].y()
+            xl, yl = self.points[-1].x() - x0, self.points[-1].y() - y0
+            cross = self.crossSums[-1] if self.crossSums else 0.0
+            length = self.lengthSums[-1] if self.lengthSums else 0.0
+            if movePoint is None: # Closing edge, last to first, has cross zero
+                return ( abs( cross ) / 2, length + math.hypot( xl, yl ) )
+
+            xm, ym = movePoint.x() - x0, movePoint.y() - y0
+            cross += xl * ym - xm * yl
+            return ( abs( cross ) / 2, length + math.hypot( xm - xl, ym - yl ) + math.hypot( xm, ym ) )
+
+        def isValid(self, movePoint=None):
+            """
+            Check self-intersection of ring using only the floating edge(s).
+            Consecutive edges are invalid only when overlap(back-tracking spike).
+            Rings with curves are not checked.
+            """
+            if len( self.idsMiddleCurve ):
+                return True
+
+            if self.totalCrossing:
+                return False
+
+            lenPoints = len( self.points )
+            if movePoint is None:
+                if lenPoints < 3:
+                    return True
+                first, last = self.points[0], self.points[-1]
+                return not self.segmentIndex.intersects( last.x(), last.y(), first.x(), first.y(), ( 0, lenPoints - 2 ) )
+
+            if lenPoints < 2:
+                return True
+            x0, y0 = self.points[0].x(), self.points[0].y()
+            xl, yl = self.points[-1].x(), self.points[-1].y()
+            xm, ym = movePoint.x(), movePoint.y()
+            if segmentsIntersect( xl, yl, xm, ym, xm, ym, x0, y0, True ):
+                return False
+            if self.segmentIndex.intersects( xl, yl, xm, ym, ( lenPoints - 2, ) ):
+                return False
+            return not self.segmentIndex.intersects( xm, ym, x0, y0, ( 0, ) )
+
+        def _addEdge(self):
+            idEdge = len( self.points ) - 2
+            if idEdge < 0:
+                return
+
+            p1, p2 = self.points[ idEdge ], self.points[ idEdge + 1 ]
+            x1, y1, x2, y2 = p1.x(), p1.y(), p2.x(), p2.y()
+            isCrossing = self.segmentIndex.intersects( x1, y1, x2, y2, ( idEdge - 1, ) )
+            self.edgesCrossing.append( isCrossing )
+            if isCrossing:
+                self.totalCrossing += 1
+            self.segmentIndex.add( idEdge, x1, y1, x2, y2 )
+
+            x0, y0 = self.points[0].x(), self.points[0].y()
+            x1, y1 = x1 - x0, y1 - y0
+            x2, y2 = x2 - x0, y2 - y0
+            self.crossSums.append( ( self.crossSums[-1] if self.crossSums else 0.0 ) + x1 * y2 - x2 * y1 )
+            self.lengthSums.append( ( self.lengthSums[-1] if self.lengthSums else 0.0 ) + math.hypot( x2 - x1, y2 - y1 ) )
+
+        def _removeEdges(self):
+            while len( self.edgesCrossing ) > max( len( self.points ) - 1, 0 ):
+                idEdge = len( self.edgesCrossing ) - 1
+                if self.edgesCrossing.pop():
+                    self.totalCrossing -= 1
+                self.segmentIndex.remove( idEdge )
+                self.crossSums.pop()
+                self.lengthSums.pop()
+
         @pyqtSlot(bool)
         def toggledCurve(self, checked):
             self.isCurve = checked
 
 
+class LayerConnectionManager(QObject):
+    """
+    Connect geometryChanged of all polygon layers in editing.
+    The changes of one event loop(edit command, including topological editing) are emitted together.
+    changed: [ ( layer, fid, geometry in measure CRS, measure CRS ) ]
+    """
+    changed = pyqtSignal(list)
+    def __init__(self, project):
+        super().__init__()
+        self.project = project
+        self.layers = {} # id: layer, editing signals connected
+        self.editingIds = set() # geometryChanged connected
+        self.transforms = {} # Layer CRS: QgsCoordinateTransform
+        self.destinationCrs = None # self.start
+        self.pending = {} # ( layerId, fid ): geometry layer CRS
+        self.timer = QTimer()
+        self.timer.setSingleShot( True )
+        self.timer.setInterval( 0 )
+        self.timer.timeout.connect( self.flush )
+        self.isActive = False
+        self.autoCrs = None # AutoMeasureCrs, when automatic CRS
+
+    def start(self, destinationCrs):
+        if self.isActive:
+            return
+
+        self.isActive = True
+        self.setDestinationCrs( destinationCrs )
+        self.layersAdded( list( self.project.mapLayers().values() ) )
+        self.project.layersAdded.connect( self.layersAdded )
+        self.project.layerWillBeRemoved.connect( self.layerWillBeRemoved )
+
+    def stop(self):
+        if not self.isActive:
+            return
+
+        self.project.layersAdded.disconnect( self.layersAdded )
+        self.project.layerWillBeRemoved.disconnect( self.layerWillBeRemoved )
+        for layerId in list( self.layers ):
+            self.layerWillBeRemoved( layerId )
+        self.timer.stop()
+        self.pending.clear()
+        self.isActive = False
+
+    def setDestinationCrs(self, crs):
+        self.destinationCrs = crs
+        self.transforms.clear()
+
+    def transform(self, crs):
+        key = crs.authid() or crs.toWkt()
+        if not key in self.transforms:
+            self.transforms[ key ] = QgsCoordinateTransform( crs, self.destinationCrs, self.project )
+        return self.transforms[ key ]
+
+    @pyqtSlot('QList<QgsMapLayer*>')
+    def layersAdded(self, layers):
+        for layer in layers:
+            if not layer.type() == QgsMapLayerType.VectorLayer or \
+               not layer.geometryType() == QgsWkbTypes.PolygonGeometry or \
+               layer.id() in self.layers:
+                continue
+            self.layers[ layer.id() ] = layer
+            layer.editingStarted.connect( self.editingStarted )
+            layer.editingStopped.connect( self.editingStopped )
+            if layer.isEditable():
+                self._connectEditing( layer )
+
+    @pyqtSlot(str)
+    def layerWillBeRemoved(self, layerId):
+        if not layerId in self.layers:
+            return
+
+        layer = self.layers.pop( layerId )
+        layer.editingStarted.disconnect( self.editingStarted )
+        layer.editingStopped.disconnect( self.editingStopped )
+        if layerId in self.editingIds:
+            self._disconnectEditing( layer )
+
+    @pyqtSlot()
+    def editingStarted(self):
+        self._connectEditing( self.sender() )
+
+    @pyqtSlot()
+    def editingStopped(self):
+        self._disconnectEditing( self.sender() )
+
+    @pyqtSlot('QgsFeatureId', QgsGeometry)
+    def geometryChanged(self, fid, geometry):
+        layer = self.sender()
+        self.pending[ ( layer.id(), fid ) ] = QgsGeometry( geometry )
+        self.timer.start()
+
+    @pyqtSlot()
+    def flush(self):
+        items = []
+        for ( layerId, fid ), geometry in self.pending.items():
+            layer = self.layers.get( layerId )
+            if layer is None:
+                continue
+            crs = layer.sourceCrs()
+            if self.autoCrs is None or geometry.isEmpty():
+                ct = self.transform( crs )
+            else:
+                ct = self.autoCrs.getByGeometry( crs, geometry )
+            geometry.transform( ct )
+            items.append( ( layer, fid, geometry, ct.destinationCrs() ) )
+        self.pending.clear()
+        if items:
+            self.changed.emit( items )
+
+    def _connectEditing(self, layer):
+        if layer.id() in self.editingIds:
+            return
+        layer.geometryChanged.connect( self.geometryChanged )
+        self.editingIds.add( layer.id() )
+
+    def _disconnectEditing(self, layer):
+        if not layer.id() in self.editingIds:
+            return
+        layer.geometryChanged.disconnect( self.geometryChanged )
+        self.editingIds.discard( layer.id() )
+
+
 class ChangeGeometryEvent(BasePolygonEvent):
+    lodVertices = 100000 # Minimum of vertices for level of detail
+    lodToolName = 'mActionVertexTool' # Moves vertices
     def __init__(self,  mapCanvas):
         super().__init__( mapCanvas )
         self.objsToggleFilter = [ mapCanvas.viewport() ] # Mouse 
+        self.eventHandlers = { QEvent.MouseMove: self._mouseMove }
         self.layer = None # self.enable, self.changeLayer
         self.ctGeometry = None # self._configLayer
+        self.isMultiLayer = False # self.setMultiLayer
+        self.layerManager = LayerConnectionManager( self.project )
+        self.layerManager.changed.connect( self.layersChanged )
         self.project.layerWillBeRemoved.connect( self.layerWillBeRemoved )
-
-    def __del__(self):
-        super().__del__()
+        self.lod = None # LodMeasure of last feature edited
+        self.lodJob = 0
+        self.lodTasks = set() # Running, keep the references
+
+    def release(self):
+        super().release()
+        self._stopLod()
+        self.layerManager.changed.disconnect( self.layersChanged )
         self.project.layerWillBeRemoved.disconnect( self.layerWillBeRemoved )
 
     def enable(self):
         super().enable()
-        self.layer = self.mapCanvas.currentLayer()
-        self._configLayer()
+        if self.isMultiLayer:
+            self.layerManager.start( self.crs_unit['crs'] )
+            return
+
+        layer = self.mapCanvas.currentLayer()
+        if self.isPolygonLayer( layer ): # Otherwise, set by changeLayer
+            self.layer = layer
+            self._configLayer()
 
     def disable(self):
         super().disable()
+        self._stopLod()
+        self.layerManager.stop()
         if not self.layer is None:
             self.layer.geometryChanged.disconnect( self.geometryChanged )
+            self.layer = None
+
+    def setCrsUnit(self, crs_unit):
+        super().setCrsUnit( crs_unit )
+        self.layerManager.setDestinationCrs( self.crs_unit['crs'] )
+        self.layerManager.autoCrs = self.autoCrs if self.crs_unit['auto'] else None
+        self._stopLod()
+        if not self.ctGeometry is None:
+            self.ctGeometry.setDestinationCrs( self.crs_unit['crs'] )
+
+    def setMultiLayer(self, enabled):
+        if enabled == self.isMultiLayer:
+            return
+
+        isEnabled = self.isEnabled
+        if isEnabled:
+            self.disable()
+        self.isMultiLayer = enabled
+        if isEnabled:
+            self.enable()
 
     def changeLayer(self, layer):
-        self.layer.geometryChanged.disconnect( self.geometryChanged )
+        if self.isMultiLayer:
+            return
+
+        if not self.layer is None:
+            self.layer.geometryChanged.disconnect( self.geometryChanged )
+        self._stopLod()
         self.layer = layer
         self._configLayer()
 
-    @pyqtSlot(QObject, QEvent)
-    def eventFilter(self, watched, event):
-        if event.type() == QEvent.MouseMove:
-            self.annotationCanvas.remove()
-        
-        return False
+    def _mouseMove(self, event):
+        self.removeAnnotation()
 
     @pyqtSlot(str)
     def layerWillBeRemoved(self, layerId):
         if not self.layer is None and layerId == self.layer.id():
             self.layer.geometryChanged.disconnect( self.geometryChanged )
             self.layer = None
+            self._stopLod()
 
     @pyqtSlot('QgsFeatureId', QgsGeometry)
     def geometryChanged(self, fid, geometry):
         if not self.isEnabled:
             return
 
-        geometry.transform( self.ctGeometry )
-        msg = self.stringMeasures( geometry )
+        ct = self.transformMeasure( self.layer.sourceCrs(), geometry, self.ctGeometry )
+        isLod = \
+            not geometry.isEmpty() and \
+            geometry.constGet().nCoordinates() >= self.lodVertices and \
+            not QgsWkbTypes.isCurvedType( geometry.wkbType() )
+        if isLod:
+            # Preview by moved vertex, the exact measure is rebuilt in a task
+            self._buildLod( fid, geometry, ct )
+            if self._moveVertexLod( fid, geometry, ct ):
+                area, length = self.lod.area(), self.lod.length()
+                self._showLabel( self.stringValues( area, length ) )
+                self.publish( self.layer, fid, area, length, ct.destinationCrs(), False )
+                return
+
+        self.lod = None # Not is the geometry, waiting the rebuild
+        geometry.transform( ct )
+        area, length = geometry.area(), geometry.length()
+        self._showLabel( self.stringValues( area, length ) )
+        if not isLod: # Anchored when built
+            self.anchorLabel( geometry, ct.destinationCrs() )
+        self.publish( self.layer, fid, area, length, ct.destinationCrs(), not isLod )
+
+    @pyqtSlot(int, object)
+    def lodBuilt(self, jobId, lod):
+        task = self.sender()
+        self.lodTasks.discard( task )
+        if not jobId == self.lodJob or lod is None:
+            return
+
+        self.lod = lod
+        area, length = lod.area(), lod.length()
+        if self.annotationCanvas.isAdded: # Mouse not moved
+            self._showLabel( self.stringValues( area, length ) )
+            self.anchorLabel( task.geometry, lod.crs )
+        layer = self.project.mapLayer( lod.layerId )
+        self.publish( layer, lod.fid, area, length, lod.crs, True )
+
+    @pyqtSlot(list)
+    def layersChanged(self, items):
+        if not self.isEnabled:
+            return
+
+        labels = []
+        for layer, fid, geometry, crs in items:
+            area, length = geometry.area(), geometry.length()
+            self.publish( layer, fid, area, length, crs, True )
+            measures = self.stringValues( area, length )
+            if len( items ) > 1:
+                measures = measures.replace( '\n', ', ' )
+                measures = f"{layer.name()}({fid}): {measures}"
+            labels.append( measures )
+
+        self._showLabel( '\n'.join( labels ) )
+        if len( items ) == 1:
+            _layer, _fid, geometry, crs = items[0]
+            self.anchorLabel( geometry, crs )
+
+    def _showLabel(self, label):
         pointXY = self.mapCanvas.getCoordinateTransform().toMapCoordinates( self.mapCanvas.mouseLastXY() )
-        self.annotationCanvas.setText( msg, pointXY )
+        self.annotationCanvas.setText( label, pointXY )
+
+    def _buildLod(self, fid, geometry, ct):
+        self._stopLod( False )
+        task = LodMeasureTask( self.lodJob, self.layer.id(), fid, QgsGeometry( geometry ), ct )
+        task.built.connect( self.lodBuilt )
+        self.lodTasks.add( task )
+        QgsApplication.taskManager().addTask( task )
+
+    def _moveVertexLod(self, fid, geometry, ct):
+        lod = self.lod
+        if \
+            lod is None or \
+            not ( lod.layerId, lod.fid ) == ( self.layer.id(), fid ) or \
+            not lod.crs == ct.destinationCrs() or \
+            not lod.vertexCount == geometry.constGet().nCoordinates():
+            return False
+
+        mapTool = self.mapCanvas.mapTool()
+        action = None if mapTool is None else mapTool.action()
+        if action is None or not action.objectName() == self.lodToolName:
+            return False
+
+        # Compared with the source of lod, cheaper than the rebuild
+        changed = lod.changedVertex( geometry )
+        if changed is None: # Several vertices
+            return False
+
+        part, ring, vertex, x, y = changed
+        point = ct.transform( QgsPointXY( x, y ) )
+        return lod.moveVertex( part, ring, vertex, point.x(), point.y(), ( x, y ) )
+
+    def _stopLod(self, clear=True):
+        self.lodJob += 1 # Stale running tasks
+        for task in self.lodTasks:
+            task.cancel()
+        if clear:
+            self.lod = None
 
     def _configLayer(self):
         self.layer.geometryChanged.connect( self.geometryChanged )
         self.ctGeometry = QgsCoordinateTransform( self.layer.sourceCrs(), self.measure.sourceCrs(), self.project )
 
 
+class PartsMeasureTask(QgsTask):
+    """
+    Apply the split or reshape line to a copy of target features and measure the parts.
+    Result: list of ( pointXY(map CRS), area, length(measure CRS) )
+    """
+    measured = pyqtSignal(int, list)
+    def __init__(self, jobId, source, fids, points, isSplit, ctLayer2Measure, ctLayer2Map, autoCrs=None):
+        super().__init__( 'CalcArea2 split/reshape preview', QgsTask.CanCancel )
+        self.jobId = jobId
+        self.source = source
+        self.fids = fids
+        self.points = points
+        self.isSplit = isSplit
+        self.ctLayer2Measure = QgsCoordinateTransform( ctLayer2Measure )
+        self.ctLayer2Map = QgsCoordinateTransform( ctLayer2Map )
+        self.autoCrs = autoCrs # AutoMeasureCrs of task
+        self.parts = []
+
+    def run(self):
+        def split(geom):
+            result, newGeoms, _topologyPoints = geom.splitGeometry( self.points, False )
+            return [ geom ] + newGeoms if result == QgsGeometry.Success else []
+
+        def reshape(geom):
+            result = geom.reshapeGeometry( QgsLineString( self.points ) )
+            return [ geom ] if result == QgsGeometry.Success else []
+
+        f_parts = split if self.isSplit else reshape
+        line = QgsGeometry.fromPolylineXY( self.points )
+        request = QgsFeatureRequest().setFilterRect( line.boundingBox() ).setNoAttributes()
+        if self.fids:
+            request.setFilterFids( self.fids )
+        for feat in self.source.getFeatures( request ):
+            if self.isCanceled():
+                return False
+            geom = feat.geometry()
+            if not geom.intersects( line ):
+                continue
+            for part in f_parts( geom ):
+                point = self.ctLayer2Map.transform( part.pointOnSurface().asPoint() )
+                ct = self.ctLayer2Measure
+                if not self.autoCrs is None:
+                    ct = self.autoCrs.getByGeometry( ct.sourceCrs(), part )
+                part.transform( ct )
+                self.parts.append( ( point, part.area(), part.length() ) )
+
+        return True
+
+    def finished(self, result):
+        self.measured.emit( self.jobId, self.parts if result else [] )
+
+
+class SplitReshapeEvent(BasePolygonEvent):
+    actionNames = ( 'mActionSplitFeatures', 'mActionReshapeFeatures' )
+    def __init__(self, mapCanvas):
+        super().__init__( mapCanvas )
+        self.objsToggleFilter = [
+            mapCanvas, # Keyboard
+            mapCanvas.viewport() # Mouse
+        ]
+        self.eventHandlers = {
+            QEvent.MouseMove: self._mouseMove,
+            QEvent.MouseButtonRelease: self._mouseRelease,
+            QEvent.KeyRelease: self._keyRelease
+        }
+        self.keyHandlers = {
+            Qt.Key_Escape: self._keyEscape,
+            Qt.Key_Delete: self._keyDelete,
+            Qt.Key_Backspace: self._keyDelete
+        }
+        self.isSplit = True # self.setMode
+        self.annotationParts = [] # AnnotationCanvas by part
+        self.points = [] # Line, layer CRS
+        self.layer, self.source, self.fids = None, None, None # self._startLine
+        self.ctMap2Layer, self.ctLayer2Measure, self.ctLayer2Map = None, None, None
+        self.jobId = 0
+        self.task = None # Running
+        self.pendingPoints = None
+
+    def release(self):
+        super().release()
+        for annot in self.annotationParts:
+            annot.release()
+        self.annotationParts.clear()
+
+    def setMode(self, actionName):
+        self.isSplit = actionName == 'mActionSplitFeatures'
+        self._clear()
+
+    def disable(self):
+        self._clear()
+        super().disable()
+
+    def removeAnnotation(self):
+        super().removeAnnotation()
+        for annot in self.annotationParts:
+            annot.remove()
+
+    def _layerPoint(self, event):
+        pos = event.localPos()
+        point = self.mapCanvas.getCoordinateTransform().toMapCoordinates( pos.x(), pos.y() )
+        return self.ctMap2Layer.transform( point )
+
+    def _startLine(self):
+        self.layer = self.mapCanvas.currentLayer()
+        self.source = QgsVectorLayerFeatureSource( self.layer )
+        self.fids = self.layer.selectedFeatureIds()
+        self.ctMap2Layer = QgsCoordinateTransform( self.project.crs(), self.layer.crs(), self.project )
+        self.ctLayer2Measure = QgsCoordinateTransform( self.layer.crs(), self.crs_unit['crs'], self.project )
+        self.ctLayer2Map = QgsCoordinateTransform( self.layer.crs(), self.project.crs(), self.project )
+
+    def _clear(self):
+        self.points.clear()
+        self.pendingPoints = None
+        self.jobId += 1 # Stale running job
+        if not self.task is None:
+            self.task.cancel()
+        self.removeAnnotation()
+
+    def _mouseMove(self, event):
+        if not self.isEnabled or not self.points:
+            return
+
+        self._measure( self.points + [ self._layerPoint( event ) ] )
+
+    def _mouseRelease(self, event):
+        button = event.button()
+        if button == Qt.LeftButton:
+            if not self.points:
+                self._startLine()
+            self.points.append( self._layerPoint( event ) )
+            return
+
+        if button == Qt.RightButton: # Finished by map tool
+            self._clear()
+
+    def _keyRelease(self, event):
+        handler = self.keyHandlers.get( event.key() )
+        if not handler is None:
+            handler( event )
+
+    def _keyEscape(self, event):
+        self._clear()
+
+    def _keyDelete(self, event):
+        if self.points:
+            self.points.pop()
+        if len( self.points ) < 1:
+            self._clear()
+
+    def _measure(self, points):
+        # Only one job running, the stale job is canceled and the last line waits it
+        self.jobId += 1
+        if not self.task is None:
+            self.pendingPoints = points
+            self.task.cancel()
+            return
+
+        args = (
+            self.jobId, self.source, self.fids, points, self.isSplit,
+            self.ctLayer2Measure, self.ctLayer2Map,
+            self.workerAutoCrs()
+        )
+        self.task = PartsMeasureTask( *args )
+        self.task.measured.connect( self.measured )
+        QgsApplication.taskManager().addTask( self.task )
+
+    @pyqtSlot(int, list)
+    def measured(self, jobId, parts):
+        self.task = None
+        if not self.pendingPoints is None:
+            points, self.pendingPoints = self.pendingPoints, None
+            self._measure( points )
+            return
+
+        if not jobId == self.jobId or not self.isEnabled:
+            return
+
+        while len( self.annotationParts ) < len( parts ):
+            self.annotationParts.append( AnnotationCanvas() )
+        for annot in self.annotationParts[ len( parts ): ]:
+            annot.remove()
+        for annot, ( point, area, length ) in zip( self.annotationParts, parts ):
+            annot.setText( self.stringValues( area, length ), point )
+
+
 class CalcAreaEvent(QObject):
+    """
+    Public API for other plugins:
+      measured(layerId, fid, area, perimeter, areaUnit, lengthUnit, crs, isFinal)
+        fid: FID_NULL when the feature is being digitized
+        areaUnit, lengthUnit: QgsUnitTypes.encodeUnit
+        crs: authid of measure CRS
+        isFinal: False for live values(throttled and coalesced by feature)
+    Ex.: qgis.utils.plugins['calcarea2'].toolEvent.measured.connect( slot )
+    """
     validLayer = pyqtSignal(bool)
+    measured = pyqtSignal(str, 'qint64', float, float, str, str, str, bool)
     def __init__(self, iface):
         super().__init__()
         self.iface = iface
         self.mapCanvas = iface.mapCanvas()
         self.addFeatureEvent = AddFeatureEvent( iface )
         self.changeGeometryEvent =  ChangeGeometryEvent( self.mapCanvas )
+        self.splitReshapeEvent = SplitReshapeEvent( self.mapCanvas )
+        self.events = ( self.addFeatureEvent, self.changeGeometryEvent, self.splitReshapeEvent )
         self.currentEvent = None
+        self.publisher = MeasurePublisher( self )
+        self.publisher.measured.connect( self.measured )
+        for event in ( self.addFeatureEvent, self.changeGeometryEvent ):
+            event.publisher = self.publisher
 
         isValid = self._isValidLayer( self.mapCanvas.currentLayer() )
         self.addFeatureEvent.isValidLayer = isValid
@@ -485,14 +1264,15 @@ class CalcAreaEvent(QObject):
         self.mapCanvas.mapToolSet.connect( self.changeMapTool )
         self.iface.currentLayerChanged.connect( self.currentLayerChanged )
 
-    def __del__(self):
-        if self.addFeatureEvent.isEnabled:
-            self.addFeatureEvent.disable()
-        if self.addFeatureEvent.isEventFiltered:
-            self.addFeatureEvent.toggleEventFilter()
-
-        if self.changeGeometryEvent.isEnabled:
-            self.changeGeometryEvent.disable()
+    def release(self):
+        """
+        Explicit cleanup, called by CalcAreaPlugin.unload
+        """
+        self.currentEvent = None
+        for event in self.events:
+            event.release()
+        self.publisher.stop()
+        self.publisher.measured.disconnect( self.measured )
 
         self.mapCanvas.mapToolSet.disconnect( self.changeMapTool )
         self.iface.currentLayerChanged.disconnect( self.currentLayerChanged )
@@ -508,45 +1288,26 @@ class CalcAreaEvent(QObject):
                 if event.isEnabled:
                     event.disable()
 
-        events = ( self.addFeatureEvent, self.changeGeometryEvent )
-        enable( events ) if checked else disable( events )
+        enable( self.events ) if checked else disable( self.events )
+        self._updateEventFilter()
 
     def setCrsUnit(self, crs_unit):
-        self.addFeatureEvent.setCrsUnit( crs_unit )
-        self.changeGeometryEvent.setCrsUnit( crs_unit )
+        for event in self.events:
+            event.setCrsUnit( crs_unit )
 
     def getCrsUnit(self):
         return self.addFeatureEvent.crs_unit
 
+    def setMultiLayer(self, enabled):
+        self.changeGeometryEvent.setMultiLayer( enabled )
+
     @pyqtSlot(QgsMapTool, QgsMapTool)
     def changeMapTool(self, newTool, oldTool=None):
-        def enableEvent(event, enabled=True):
-            # Enable: if not isEventFiltered
-            # Disable: if isEventFiltered
-            funcValid = ( lambda filter: not filter ) if enabled else ( lambda filter: filter )
-            if funcValid( event.isEventFiltered ):
-                event.toggleEventFilter()
-
         # Remove annotations
-        for event in ( self.addFeatureEvent, self.changeGeometryEvent ):
-            event.annotationCanvas.remove()
+        for event in self.events:
+            event.removeAnnotation()
 
-        self.currentEvent = None
-
-        mapTool = newTool
-        if not isinstance( mapTool, QgsMapTool ):
-            mapTool = self.mapCanvas.mapTool()
-
-        enableEvent( self.addFeatureEvent, False )
-        enableEvent( self.changeGeometryEvent, False )
-        if not isinstance( mapTool, QgsMapTool ) or \
-           not mapTool.flags() == QgsMapTool.EditTool or \
-           not self._isValidLayer( self.mapCanvas.currentLayer() ):
-           return
-
-        name = mapTool.action().objectName()
-        self.currentEvent = self.addFeatureEvent if name == 'mActionAddFeature' else self.changeGeometryEvent
-        enableEvent( self.currentEvent )
+        self._setCurrentEvent( newTool )
 
     @pyqtSlot('QgsMapLayer*')
     def currentLayerChanged(self, layer):
@@ -555,18 +1316,40 @@ class CalcAreaEvent(QObject):
         self.addFeatureEvent.isValidLayer = isValid
 
         if not isValid and not self.currentEvent is None:
-            self.currentEvent.annotationCanvas.remove()
+            self.currentEvent.removeAnnotation()
+
+        self._setCurrentEvent()
 
         if isValid and \
            self.currentEvent == self.changeGeometryEvent and \
            self.changeGeometryEvent.isEnabled and \
            not self.changeGeometryEvent.layer == layer:
            self.changeGeometryEvent.changeLayer( layer)
-            
+
+    def _setCurrentEvent(self, mapTool=None):
+        if not isinstance( mapTool, QgsMapTool ):
+            mapTool = self.mapCanvas.mapTool()
+
+        self.currentEvent = None
+        if isinstance( mapTool, QgsMapTool ) and \
+           mapTool.flags() == QgsMapTool.EditTool and \
+           self._isValidLayer( self.mapCanvas.currentLayer() ):
+            action = mapTool.action()
+            name = '' if action is None else action.objectName()
+            if name == 'mActionAddFeature':
+                self.currentEvent = self.addFeatureEvent
+            elif name in SplitReshapeEvent.actionNames:
+                self.currentEvent = self.splitReshapeEvent
+                self.currentEvent.setMode( name )
+            else:
+                self.currentEvent = self.changeGeometryEvent
+
+        self._updateEventFilter()
+
+    def _updateEventFilter(self):
+        # Filters only while measuring a valid layer, otherwise the canvas events not enter in Python
+        for event in self.events:
+            event.setEventFilter( event is self.currentEvent and event.isEnabled )
+
     def _isValidLayer(self, layer):
-        return \
-            False if \
-                layer is None or \
-                not layer.type() == QgsMapLayerType.VectorLayer or \
-                not layer.geometryType() == QgsWkbTypes.PolygonGeometry \
-        else True
+        return BasePolygonEvent.isPolygonLayer( layer )
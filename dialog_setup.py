@@ -29,6 +29,7 @@ from qgis.PyQt.QtCore import pyqtSlot
 from qgis.PyQt.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout,
     QComboBox,
+    QCheckBox,
     QLabel,
     QDialogButtonBox,
     QSpacerItem, QSizePolicy
@@ -56,20 +57,23 @@ def buttonOkCancel():
 
 
 class DialogSetup(QDialog):
-    def __init__(self, parent, title, crs_current_layer, length, area):
+    def __init__(self, parent, title, crs_current_layer, length, area, auto=False, cache=False):
         super().__init__( parent )
         self.title = title
         self.msgBar = QgsMessageBar()
 
-        lytCrs = self._layoutCrs( crs_current_layer ) # self.psCrs
+        lytCrs = self._layoutCrs( crs_current_layer, auto ) # self.psCrs, self.ckAuto
         lytUnitLength = self._layoutUnitLength( length ) # self.cmbUnitLength
         lytUnitArea = self._layoutUnitArea( area ) # self.cmbUnitArea
+        self.ckCache = QCheckBox( self.tr('Persistent cache of hover measures') )
+        self.ckCache.setChecked( cache )
 
         self.setWindowTitle( title )
         lytMain = QVBoxLayout()
         lytMain.addWidget( self.msgBar )
         for lyt in ( lytCrs, lytUnitLength, lytUnitArea ):
             lytMain.addLayout( lyt )
+        lytMain.addWidget( self.ckCache )
 
         btnBox = buttonOkCancel()
         btnBox.accepted.connect( self.accept )
@@ -82,10 +86,12 @@ class DialogSetup(QDialog):
         return {
             'crs': self.psCrs.crs(),
             'length':  QgsUnitTypes.DistanceUnit( self.cmbUnitLength.currentData() ),
-            'area': QgsUnitTypes.AreaUnit( self.cmbUnitArea.currentData() )
+            'area': QgsUnitTypes.AreaUnit( self.cmbUnitArea.currentData() ),
+            'auto': self.ckAuto.isChecked(),
+            'cache': self.ckCache.isChecked()
         }
 
-    def _layoutCrs(self, crs_current_layer):
+    def _layoutCrs(self, crs_current_layer, auto):
         def projectionSelectionWidget():
             p = QgsProjectionSelectionWidget()
             for opt in ( p.LayerCrs, p.ProjectCrs, p.CurrentCrs, p.DefaultCrs, p.RecentCrs ):
@@ -102,12 +108,17 @@ class DialogSetup(QDialog):
         if 'layer' in crs_current_layer:
             self.psCrs.setLayerCrs( crs_current_layer['layer'] )        
         self.psCrs.crsChanged.connect( crsChanged )
+        self.ckAuto = QCheckBox( self.tr('Automatic (UTM zone of feature)') )
+        self.ckAuto.toggled.connect( lambda checked: self.psCrs.setEnabled( not checked ) )
+        self.ckAuto.setChecked( auto )
+        self.psCrs.setEnabled( not auto )
 
         lyt = QVBoxLayout()
         label = QLabel( self.tr('Coordinate Reference System') )
         boldLabel( label )
         lyt.addWidget( label )
         lyt.addWidget( self.psCrs )
+        lyt.addWidget( self.ckAuto )
 
         return lyt
 
@@ -162,7 +173,7 @@ class DialogSetup(QDialog):
     @pyqtSlot()
     def accept(self):
         crs = self.psCrs.crs()
-        if not crs.isValid() or crs.isGeographic():
+        if not self.ckAuto.isChecked() and ( not crs.isValid() or crs.isGeographic() ):
             self._messageErrorCrs()
             return
 
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Extent Labels
+Description          : Label the area of polygons in visible extent
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import math
+
+from collections import OrderedDict
+
+from qgis.PyQt.QtCore import Qt, QPointF, pyqtSlot, pyqtSignal
+from qgis.PyQt.QtGui import QFont, QColor
+
+from qgis.core import (
+    QgsApplication, QgsTask,
+    QgsMapLayerType, QgsWkbTypes,
+    QgsRectangle, QgsPointXY,
+    QgsCoordinateTransform,
+    QgsFeatureRequest, QgsVectorLayerFeatureSource
+)
+from qgis.gui import QgsMapCanvasItem
+
+from .calcareaevent import BasePolygonEvent
+from .autocrs import AutoMeasureCrs
+
+
+def tileKey(level, point):
+    size = 2.0 ** level
+    return ( level, math.floor( point.x() / size ), math.floor( point.y() / size ) )
+
+def tileRect(key):
+    level, col, row = key
+    size = 2.0 ** level
+    return QgsRectangle( col * size, row * size, ( col + 1 ) * size, ( row + 1 ) * size )
+
+
+class AreaLabelsCanvasItem(QgsMapCanvasItem):
+    def __init__(self, mapCanvas):
+        super().__init__( mapCanvas )
+        self.mapCanvas = mapCanvas
+        self.labels = [] # ( pointXY map CRS, text )
+        self.font = QFont()
+        self.font.setPointSize(9)
+        self.font.setBold( True )
+        self.halo = QColor( 255, 255, 255, 200 )
+
+    def setLabels(self, labels):
+        self.labels = labels
+        self.setRect( self.mapCanvas.extent() )
+        self.update()
+
+    def paint(self, painter, *args):
+        painter.setFont( self.font )
+        metrics = painter.fontMetrics()
+        for point, text in self.labels:
+            pos = self.toCanvasCoordinates( point ) - self.pos()
+            width = metrics.horizontalAdvance( text )
+            origin = QPointF( pos.x() - width / 2, pos.y() + metrics.ascent() / 2 )
+            painter.setPen( self.halo )
+            for dx, dy in ( ( -1, 0 ), ( 1, 0 ), ( 0, -1 ), ( 0, 1 ) ):
+                painter.drawText( origin + QPointF( dx, dy ), text )
+            painter.setPen( Qt.black )
+            painter.drawText( origin, text )
+
+
+class TilesMeasureTask(QgsTask):
+    """
+    Measure the features by tile, a feature belongs to the tile of its point on surface(map CRS).
+    Result: { tileKey: { fid: ( pointXY map CRS, area measure CRS ) } }
+    """
+    measured = pyqtSignal(int, dict)
+    def __init__(self, generation, serial, source, keys, ctMap2Layer, ctLayer2Map, ctLayer2Measure, autoCrs=None):
+        super().__init__( 'CalcArea2 extent labels', QgsTask.CanCancel )
+        self.generation = generation
+        self.serial = serial # Start, for edits after snapshot of source
+        self.source = source
+        self.keys = keys
+        self.ctMap2Layer = QgsCoordinateTransform( ctMap2Layer )
+        self.ctLayer2Map = QgsCoordinateTransform( ctLayer2Map )
+        self.ctLayer2Measure = QgsCoordinateTransform( ctLayer2Measure )
+        self.autoCrs = autoCrs # AutoMeasureCrs of task
+        self.tiles = {}
+
+    def run(self):
+        for id, key in enumerate( self.keys ):
+            if self.isCanceled():
+                return False
+            rect = self.ctMap2Layer.transformBoundingBox( tileRect( key ) )
+            request = QgsFeatureRequest().setFilterRect( rect ).setNoAttributes()
+            tile = {}
+            for feat in self.source.getFeatures( request ):
+                if self.isCanceled():
+                    return False
+                geom = feat.geometry()
+                point = self.ctLayer2Map.transform( geom.pointOnSurface().asPoint() )
+                if not tileKey( key[0], point ) == key:
+                    continue
+                ct = self.ctLayer2Measure
+                if not self.autoCrs is None:
+                    ct = self.autoCrs.getByGeometry( ct.sourceCrs(), geom )
+                geom.transform( ct )
+                tile[ feat.id() ] = ( point, geom.area() )
+            self.tiles[ key ] = tile
+            self.setProgress( 100.0 * ( id + 1 ) / len( self.keys ) )
+
+        return True
+
+    def finished(self, result):
+        self.measured.emit( self.generation, self.tiles )
+
+
+class ExtentLabelEvent(BasePolygonEvent):
+    """
+    Tiles(map CRS) have size power of 2 by the scale, about 4 tiles by width of canvas.
+    Only the tiles not cached are measured(in a task), edits recompute only the feature.
+    """
+    def __init__(self, iface, maxTiles=512):
+        super().__init__( iface.mapCanvas() )
+        self.iface = iface
+        self.maxTiles = maxTiles
+        self.canvasItem = None # self.enable
+        self.layer = None # self.setLayer
+        self.ctMap2Layer, self.ctLayer2Map, self.ctLayer2Measure = None, None, None
+        self.tiles = OrderedDict() # tileKey: { fid: ( point, area ) }, last used at end
+        self.fidTiles = {} # fid: set( tileKey )
+        self.pendingKeys = set()
+        self.editedFids = {} # fid: serial of edit, while tasks started before are running
+        self.tasks = set() # Running of current generation
+        self.canceledTasks = set() # Keep the references until finished
+        self.autoCrsFree = [] # AutoMeasureCrs not used by running tasks
+        self.serial = 0 # Order of starts of tasks and edits
+        self.generation = 0 # Discard results of old layer or CRS
+        self.iface.currentLayerChanged.connect( self.setLayer )
+
+    def release(self):
+        super().release()
+        self.iface.currentLayerChanged.disconnect( self.setLayer )
+
+    def enable(self):
+        super().enable()
+        self.canvasItem = AreaLabelsCanvasItem( self.mapCanvas )
+        self.mapCanvas.extentsChanged.connect( self.extentsChanged )
+        self.setLayer( self.mapCanvas.currentLayer() )
+
+    def disable(self):
+        super().disable()
+        self.setLayer( None )
+        self.mapCanvas.extentsChanged.disconnect( self.extentsChanged )
+        self.mapCanvas.scene().removeItem( self.canvasItem )
+        self.canvasItem = None
+
+    def setCrsUnit(self, crs_unit):
+        super().setCrsUnit( crs_unit )
+        self.setLayer( self.layer )
+
+    @pyqtSlot('QgsMapLayer*')
+    def setLayer(self, layer):
+        def isValid():
+            return \
+                not layer is None and \
+                layer.type() == QgsMapLayerType.VectorLayer and \
+                layer.geometryType() == QgsWkbTypes.PolygonGeometry
+
+        signals = ( 'geometryChanged', 'featureAdded', 'featureDeleted' )
+        if not self.layer is None:
+            for signal in signals:
+                getattr( self.layer, signal ).disconnect( self.featureChanged )
+            self.layer = None
+        self._clearCache()
+
+        if not self.isEnabled or not isValid():
+            if not self.canvasItem is None:
+                self.canvasItem.setLabels( [] )
+            return
+
+        self.layer = layer
+        for signal in signals:
+            getattr( self.layer, signal ).connect( self.featureChanged )
+        self.ctMap2Layer = QgsCoordinateTransform( self.project.crs(), self.layer.crs(), self.project )
+        self.ctLayer2Map = QgsCoordinateTransform( self.layer.crs(), self.project.crs(), self.project )
+        self.ctLayer2Measure = QgsCoordinateTransform( self.layer.crs(), self.crs_unit['crs'], self.project )
+        self.extentsChanged()
+
+    @pyqtSlot()
+    def crsChanged(self):
+        super().crsChanged()
+        self.setLayer( self.layer )
+
+    @pyqtSlot()
+    def extentsChanged(self):
+        if self.layer is None:
+            return
+
+        keys = self._visibleKeys()
+        missing = [ key for key in keys if not key in self.tiles and not key in self.pendingKeys ]
+        for key in keys:
+            if key in self.tiles:
+                self.tiles.move_to_end( key )
+        if missing:
+            self._measureTiles( missing )
+        self._updateLabels( keys )
+
+    @pyqtSlot('QgsFeatureId')
+    def featureChanged(self, fid):
+        if self.tasks:
+            self.serial += 1
+            self.editedFids[ fid ] = self.serial # Snapshots of running tasks are stale
+        self._measureFeature( fid )
+        self._updateLabels( self._visibleKeys() )
+
+    @pyqtSlot(int, dict)
+    def measured(self, generation, tiles):
+        task = self.sender()
+        self.tasks.discard( task )
+        self.canceledTasks.discard( task )
+        if not task.autoCrs is None:
+            self.autoCrsFree.append( task.autoCrs )
+        if not generation == self.generation:
+            return
+
+        self.pendingKeys.difference_update( task.keys )
+
+        # Drop only the features edited after start of task
+        staleFids = [ fid for fid, serial in self.editedFids.items() if serial > task.serial ]
+        for fid in staleFids:
+            for tile in tiles.values():
+                tile.pop( fid, None )
+        serial = min( ( t.serial for t in self.tasks ), default=self.serial )
+        self.editedFids = { fid: s for fid, s in self.editedFids.items() if s > serial }
+
+        for key, tile in tiles.items():
+            self.tiles[ key ] = tile
+            for fid in tile:
+                self.fidTiles.setdefault( fid, set() ).add( key )
+        while len( self.tiles ) > self.maxTiles:
+            key, tile = self.tiles.popitem( last=False )
+            for fid in tile:
+                self.fidTiles.get( fid, set() ).discard( key )
+        for fid in staleFids: # Current geometry in new tiles
+            self._measureFeature( fid )
+        self._updateLabels( self._visibleKeys() )
+
+    def _measureFeature(self, fid):
+        # Recompute only the feature, in tiles cached of each level
+        for key in self.fidTiles.pop( fid, () ):
+            if key in self.tiles:
+                self.tiles[ key ].pop( fid, None )
+
+        feats = list( self.layer.getFeatures( QgsFeatureRequest( fid ).setNoAttributes() ) )
+        if feats and feats[0].hasGeometry():
+            geom = feats[0].geometry()
+            point = self.ctLayer2Map.transform( geom.pointOnSurface().asPoint() )
+            geom.transform( self.transformMeasure( self.layer.crs(), geom, self.ctLayer2Measure ) )
+            levels = { key[0] for key in self.tiles }
+            for level in levels:
+                key = tileKey( level, point )
+                if key in self.tiles:
+                    self.tiles[ key ][ fid ] = ( point, geom.area() )
+                    self.fidTiles.setdefault( fid, set() ).add( key )
+
+    def _clearCache(self):
+        self.generation += 1
+        for task in self.tasks:
+            task.cancel()
+        self.canceledTasks.update( self.tasks )
+        self.tasks.clear()
+        self.tiles.clear()
+        self.fidTiles.clear()
+        self.pendingKeys.clear()
+        self.editedFids.clear()
+
+    def _visibleKeys(self):
+        extent = self.mapCanvas.extent()
+        size = max( extent.width(), extent.height() )
+        if not size > 0:
+            return []
+
+        level = math.floor( math.log2( size / 4 ) )
+        first = tileKey( level, QgsPointXY( extent.xMinimum(), extent.yMinimum() ) )
+        last = tileKey( level, QgsPointXY( extent.xMaximum(), extent.yMaximum() ) )
+        return [
+            ( level, col, row )
+            for col in range( first[1], last[1] + 1 )
+            for row in range( first[2], last[2] + 1 )
+        ]
+
+    def _measureTiles(self, keys):
+        source = QgsVectorLayerFeatureSource( self.layer ) # Snapshot by task
+        autoCrs = None # One by running task, reused
+        if self.crs_unit['auto']:
+            autoCrs = self.autoCrsFree.pop() if self.autoCrsFree else AutoMeasureCrs( self.project.transformContext() )
+        self.serial += 1
+        args = ( self.generation, self.serial, source, keys, self.ctMap2Layer, self.ctLayer2Map, self.ctLayer2Measure, autoCrs )
+        task = TilesMeasureTask( *args )
+        task.measured.connect( self.measured )
+        self.tasks.add( task )
+        self.pendingKeys.update( keys )
+        QgsApplication.taskManager().addTask( task )
+
+    def _updateLabels(self, keys):
+        f_area, abbreviation = self.unitLabels[:2]
+        extent = self.mapCanvas.extent()
+        labels = []
+        for key in keys:
+            for point, area in self.tiles.get( key, {} ).values():
+                if not extent.contains( point ):
+                    continue
+                value = round( area * f_area, 2 )
+                labels.append( ( point, f"{value} {abbreviation}" ) )
+        self.canvasItem.setLabels( labels )
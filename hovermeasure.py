@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Hover Measure
+Description          : Show area and length of polygon under cursor
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+from qgis.PyQt.QtCore import QEvent, pyqtSlot
+
+from qgis.core import (
+    QgsGeometry,
+    QgsMapLayerType, QgsWkbTypes,
+    QgsRectangle,
+    QgsCoordinateTransform,
+    QgsFeatureRequest,
+    QgsSpatialIndex,
+    QgsDataSourceUri
+)
+
+from .calcareaevent import BasePolygonEvent
+
+
+class HoverMeasureEvent(BasePolygonEvent):
+    """
+    The spatial index(with geometries) is built, when needed, for the visible extent of layer.
+    Measures are cached by fid, invalidated by edits of layer.
+    """
+    def __init__(self, iface):
+        super().__init__( iface.mapCanvas() )
+        self.iface = iface
+        self.objsToggleFilter = [ self.mapCanvas.viewport() ] # Mouse
+        self.eventHandlers = {
+            QEvent.MouseMove: self._mouseMove,
+            QEvent.Leave: self._leave
+        }
+        self.layer = None # self.setLayer
+        self.ctMap2Layer, self.ctLayer2Measure = None, None
+        self.index = None # self._buildIndex
+        self.indexExtent = None # Layer CRS
+        self.measures = {} # fid: ( area, length )
+        self.measureCache = None # MeasureCache, self.setMeasureCache
+        self.layerSource = None
+        self.currentFid = None
+        self.iface.currentLayerChanged.connect( self.setLayer )
+
+    def release(self):
+        super().release()
+        self.setLayer( None )
+        self.iface.currentLayerChanged.disconnect( self.setLayer )
+
+    def enable(self):
+        super().enable()
+        self.setLayer( self.mapCanvas.currentLayer() )
+
+    def disable(self):
+        super().disable()
+        self.setLayer( None )
+
+    def setCrsUnit(self, crs_unit):
+        super().setCrsUnit( crs_unit )
+        self._clearCache()
+        if not self.layer is None:
+            self.ctLayer2Measure.setDestinationCrs( self.crs_unit['crs'] )
+
+    def setMeasureCache(self, measureCache):
+        self.measureCache = measureCache
+
+    @pyqtSlot('QgsMapLayer*')
+    def setLayer(self, layer):
+        def isValid():
+            return \
+                not layer is None and \
+                layer.type() == QgsMapLayerType.VectorLayer and \
+                layer.geometryType() == QgsWkbTypes.PolygonGeometry
+
+        signals = ( 'geometryChanged', 'featureAdded', 'featureDeleted' )
+        if not self.layer is None:
+            for signal in signals:
+                getattr( self.layer, signal ).disconnect( self.layerChanged )
+            self.layer = None
+        self.removeAnnotation()
+        self._clearCache()
+
+        if not self.isEnabled or not isValid():
+            self.setEventFilter( False )
+            return
+
+        self.layer = layer
+        self.layerSource = None
+        if self.measureCache:
+            source = QgsDataSourceUri.removePassword( layer.source() )
+            self.layerSource = self.measureCache.layerSource( layer.providerType(), source )
+        for signal in signals:
+            getattr( self.layer, signal ).connect( self.layerChanged )
+        self.ctMap2Layer = QgsCoordinateTransform( self.project.crs(), self.layer.crs(), self.project )
+        self.ctLayer2Measure = QgsCoordinateTransform( self.layer.crs(), self.crs_unit['crs'], self.project )
+        self.setEventFilter( True )
+
+    @pyqtSlot()
+    def crsChanged(self):
+        super().crsChanged()
+        if not self.layer is None:
+            self.ctMap2Layer.setSourceCrs( self.project.crs() )
+            self.index = None
+
+    @pyqtSlot('QgsFeatureId')
+    def layerChanged(self, fid):
+        self.measures.pop( fid, None )
+        if self.measureCache and self.layerSource:
+            self.measureCache.invalidate( self.layerSource, fid )
+        self.index = None
+        if fid == self.currentFid:
+            self.currentFid = None
+            self.removeAnnotation()
+
+    def _clearCache(self):
+        self.index = None
+        self.indexExtent = None
+        self.measures.clear()
+        self.currentFid = None
+
+    def _buildIndex(self):
+        extent = self.ctMap2Layer.transformBoundingBox( self.mapCanvas.extent() )
+        extent.scale( 1.5 ) # Margin for small pan
+        request = QgsFeatureRequest().setFilterRect( extent ).setNoAttributes()
+        self.index = QgsSpatialIndex( self.layer.getFeatures( request ), None, QgsSpatialIndex.FlagStoreFeatureGeometries )
+        self.indexExtent = extent
+
+    def _featureAt(self, point):
+        if self.index is None or not self.indexExtent.contains( point ):
+            self._buildIndex()
+
+        rect = QgsRectangle( point, point )
+        for fid in self.index.intersects( rect ):
+            if self.index.geometry( fid ).contains( point ):
+                return fid
+
+        return None
+
+    def _mouseMove(self, event):
+        pos = event.localPos()
+        pointMap = self.mapCanvas.getCoordinateTransform().toMapCoordinates( pos.x(), pos.y() )
+        fid = self._featureAt( self.ctMap2Layer.transform( pointMap ) )
+        if fid is None:
+            self.currentFid = None
+            self.removeAnnotation()
+            return
+
+        if fid == self.currentFid:
+            self.annotationCanvas.setPosition( pointMap )
+            return
+
+        if not fid in self.measures:
+            self.measures[ fid ] = self._measure( fid )
+
+        self.currentFid = fid
+        self.annotationCanvas.setText( self.stringValues( *self.measures[ fid ] ), pointMap )
+
+    def _measure(self, fid):
+        geom = QgsGeometry( self.index.geometry( fid ) )
+        if self.measureCache and self.layerSource:
+            digest = self.measureCache.digest( geom )
+            values = self.measureCache.get( self.layerSource, fid, digest, self.crs_unit )
+            if values is None:
+                geom.transform( self.transformMeasure( self.layer.crs(), geom, self.ctLayer2Measure ) )
+                values = ( geom.area(), geom.length() )
+                self.measureCache.put( self.layerSource, fid, digest, self.crs_unit, *values )
+            return values
+
+        geom.transform( self.transformMeasure( self.layer.crs(), geom, self.ctLayer2Measure ) )
+        return ( geom.area(), geom.length() )
+
+    def _leave(self, event):
+        self.currentFid = None
+        self.removeAnnotation()
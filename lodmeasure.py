@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Level of detail measure
+Description          : Exact area and perimeter of huge polygon updated by move of vertex
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import math
+
+from array import array
+
+from qgis.PyQt.QtCore import pyqtSignal
+
+from qgis.core import QgsTask, QgsCoordinateTransform
+
+
+def lineStrings(geometry):
+    """
+    geometry: Polygon without curves
+    Return [ ( ( part, ring ), QgsLineString ) ]
+    """
+    abstract = geometry.constGet()
+    if geometry.isMultipart():
+        polygons = [ abstract.geometryN( id ) for id in range( abstract.numGeometries() ) ]
+    else:
+        polygons = [ abstract ]
+    items = []
+    for part, polygon in enumerate( polygons ):
+        rings = [ polygon.exteriorRing() ] + [ polygon.interiorRing( id ) for id in range( polygon.numInteriorRings() ) ]
+        items.extend( ( ( part, ring ), line ) for ring, line in enumerate( rings ) )
+    return items
+
+
+def ratio(value):
+    """
+    Return ( numerator, exponent ), value = numerator / 2**exponent
+    """
+    numerator, denominator = value.as_integer_ratio()
+    return numerator, denominator.bit_length() - 1
+
+
+class ExactSum():
+    """
+    Sum without rounding, integer total scaled by 2**scale.
+    The value does not depend of the order of additions.
+    """
+    def __init__(self):
+        self.total = 0
+        self.scale = 0
+
+    def add(self, numerator, exponent):
+        """
+        Add numerator / 2**exponent
+        """
+        if exponent > self.scale:
+            self.total <<= exponent - self.scale
+            self.scale = exponent
+        self.total += numerator << ( self.scale - exponent )
+
+    def addFloat(self, value, sign=1):
+        numerator, exponent = ratio( value )
+        self.add( sign * numerator, exponent )
+
+    def value(self):
+        # Division of integers is correctly rounded
+        return self.total / ( 1 << self.scale )
+
+
+class LodMeasure():
+    """
+    Area and perimeter of polygon(projected CRS) by shoelace and length of edges, exactly summed by ring.
+    Move of vertex update only the sums of its edges, the values are identical to a new build of the geometry.
+    """
+    def __init__(self, layerId, fid, crs):
+        self.layerId = layerId
+        self.fid = fid
+        self.crs = crs # Measure
+        self.rings = {} # ( part, ring ): ( xs, ys, ExactSum of shoelace ), closed rings
+        self.sources = {} # ( part, ring ): ( xs, ys ) in CRS of layer, self.changedVertex
+        self.perimeter = ExactSum()
+        self.vertexCount = 0
+
+    def build(self, geometry, isCanceled=None):
+        """
+        geometry: Polygon in self.crs, without curves
+        Return False if canceled
+        """
+        polygons = geometry.asMultiPolygon() if geometry.isMultipart() else [ geometry.asPolygon() ]
+        for part, polygon in enumerate( polygons ):
+            for ring, points in enumerate( polygon ):
+                xs = array( 'd', ( point.x() for point in points ) )
+                ys = array( 'd', ( point.y() for point in points ) )
+                cross = ExactSum()
+                for id in range( len( xs ) - 1 ):
+                    if not isCanceled is None and not id % 65536 and isCanceled():
+                        return False
+                    self._addEdge( xs, ys, id, cross, 1 )
+                self.rings[ ( part, ring ) ] = ( xs, ys, cross )
+        self.vertexCount = geometry.constGet().nCoordinates()
+        return True
+
+    def setSource(self, geometry):
+        """
+        geometry: Polygon in CRS of layer, the same of build
+        """
+        self.sources = {
+            key: ( array( 'd', line.xVector() ), array( 'd', line.yVector() ) )
+            for key, line in lineStrings( geometry )
+        }
+
+    def changedVertex(self, geometry):
+        """
+        geometry: Polygon in CRS of layer, changed from source
+        Return ( part, ring, vertex, x, y ) if only one vertex is different, None otherwise
+        """
+        items = lineStrings( geometry )
+        if not len( items ) == len( self.sources ):
+            return None
+
+        changed = None
+        for key, line in items:
+            if not key in self.sources:
+                return None
+            xs, ys = self.sources[ key ]
+            newXs, newYs = array( 'd', line.xVector() ), array( 'd', line.yVector() )
+            if not len( newXs ) == len( xs ):
+                return None
+            if newXs == xs and newYs == ys:
+                continue
+
+            ids = [ id for id in range( len( xs ) ) if not ( xs[ id ] == newXs[ id ] and ys[ id ] == newYs[ id ] ) ]
+            if ids == [ 0, len( xs ) - 1 ]: # First and last are the same
+                ids = [ 0 ]
+            if not changed is None or not len( ids ) == 1:
+                return None
+            changed = ( key[0], key[1], ids[0], newXs[ ids[0] ], newYs[ ids[0] ] )
+
+        return changed
+
+    def moveVertex(self, part, ring, vertex, x, y, source=None):
+        """
+        x, y: New coordinate in self.crs
+        source: ( x, y ) new coordinate in CRS of layer, keep self.sources
+        Return False if vertex not exists
+        """
+        key = ( part, ring )
+        if not key in self.rings:
+            return False
+
+        xs, ys, cross = self.rings[ key ]
+        last = len( xs ) - 1
+        if not 0 <= vertex <= last:
+            return False
+
+        ids = ( 0, last ) if vertex in ( 0, last ) else ( vertex, ) # First and last are the same
+        edges = sorted( { edge for id in ids for edge in ( id - 1, id ) if 0 <= edge < last } )
+        for edge in edges:
+            self._addEdge( xs, ys, edge, cross, -1 )
+        for id in ids:
+            xs[ id ], ys[ id ] = x, y
+        for edge in edges:
+            self._addEdge( xs, ys, edge, cross, 1 )
+        if not source is None and key in self.sources:
+            xsSource, ysSource = self.sources[ key ]
+            for id in ids:
+                xsSource[ id ], ysSource[ id ] = source
+        return True
+
+    def area(self):
+        total = ExactSum()
+        for ( _part, ring ), ( _xs, _ys, cross ) in self.rings.items():
+            sign = 1 if ring == 0 else -1 # Interior rings are holes
+            total.add( sign * abs( cross.total ), cross.scale )
+        return total.value() / 2
+
+    def length(self):
+        return self.perimeter.value()
+
+    def _addEdge(self, xs, ys, id, cross, sign):
+        x1, y1, x2, y2 = xs[ id ], ys[ id ], xs[ id + 1 ], ys[ id + 1 ]
+        # Shoelace: x1 * y2 - x2 * y1
+        n_x1, e_x1 = ratio( x1 )
+        n_y1, e_y1 = ratio( y1 )
+        n_x2, e_x2 = ratio( x2 )
+        n_y2, e_y2 = ratio( y2 )
+        e1, e2 = e_x1 + e_y2, e_x2 + e_y1
+        exponent = max( e1, e2 )
+        numerator = ( ( n_x1 * n_y2 ) << ( exponent - e1 ) ) - ( ( n_x2 * n_y1 ) << ( exponent - e2 ) )
+        cross.add( sign * numerator, exponent )
+        self.perimeter.addFloat( math.hypot( x2 - x1, y2 - y1 ), sign )
+
+
+class LodMeasureTask(QgsTask):
+    """
+    Build the LodMeasure of feature.
+    Result: LodMeasure or None, self.geometry is in measure CRS when finished
+    """
+    built = pyqtSignal(int, object)
+    def __init__(self, jobId, layerId, fid, geometry, ctLayer2Measure):
+        super().__init__( 'CalcArea2 level of detail', QgsTask.CanCancel )
+        self.jobId = jobId
+        self.layerId = layerId
+        self.fid = fid
+        self.geometry = geometry # Copy, layer CRS
+        self.ctLayer2Measure = QgsCoordinateTransform( ctLayer2Measure )
+        self.lod = None
+
+    def run(self):
+        lod = LodMeasure( self.layerId, self.fid, self.ctLayer2Measure.destinationCrs() )
+        lod.setSource( self.geometry )
+        self.geometry.transform( self.ctLayer2Measure )
+        if not lod.build( self.geometry, self.isCanceled ):
+            return False
+        self.lod = lod
+        return True
+
+    def finished(self, result):
+        self.built.emit( self.jobId, self.lod if result else None )
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Measure Cache
+Description          : Persistent cache(SQLite) of area and length of features
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import os, sqlite3, hashlib
+
+
+class MeasureCache():
+    """
+    Key: digest of layer source, fid, geometry digest, measure CRS, area and length units
+    Value: area and length in units of measure CRS
+    The last uses(for eviction) by get are kept in memory and written by batch.
+    Use only in main thread: the hover measure. Measure table and extent labels measure in tasks.
+    """
+    WHERE_KEY = 'source = ? AND fid = ? AND digest = ? AND crs = ? AND area_unit = ? AND length_unit = ?'
+    SELECT = f"SELECT area, length FROM measure WHERE {WHERE_KEY}"
+    UPDATE_USED = f"UPDATE measure SET used = ? WHERE {WHERE_KEY}"
+    def __init__(self, filepath, maxRows=500000, commitEvery=100):
+        self.filepath = filepath
+        self.maxRows = maxRows
+        self.commitEvery = commitEvery
+        self.pending = 0
+        self.clock = 0 # Last use, for eviction
+        self.used = {} # key: clock, last uses not written
+
+        dirpath = os.path.dirname( filepath )
+        if dirpath and not os.path.exists( dirpath ):
+            os.makedirs( dirpath )
+        self.conn = sqlite3.connect( filepath )
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS measure (
+                source TEXT, fid INTEGER, digest BLOB,
+                crs TEXT, area_unit INTEGER, length_unit INTEGER,
+                area REAL, length REAL, used INTEGER,
+                PRIMARY KEY ( source, fid, digest, crs, area_unit, length_unit )
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS measure_used ON measure ( used )')
+        # Sources were plain URIs, they can have credentials
+        cursor = self.conn.execute("DELETE FROM measure WHERE instr( source, ':' ) > 0")
+        if cursor.rowcount > 0:
+            self.conn.commit()
+            self.conn.execute('VACUUM') # Not keep the deleted pages
+        row = self.conn.execute('SELECT MAX( used ) FROM measure').fetchone()
+        self.clock = row[0] or 0
+        self.rows = self.conn.execute('SELECT COUNT(*) FROM measure').fetchone()[0]
+
+    def close(self):
+        if self.conn is None:
+            return
+
+        self._writeUsed()
+        self.conn.commit()
+        self.conn.close()
+        self.conn = None
+
+    @staticmethod
+    def layerSource(providerType, source):
+        """
+        source: URI without password, Ex.: QgsDataSourceUri.removePassword( layer.source() )
+        Return digest, the URI is not stored(tokens)
+        """
+        return hashlib.blake2b( f"{providerType}:{source}".encode('utf-8'), digest_size=16 ).hexdigest()
+
+    @staticmethod
+    def digest(geometry):
+        return hashlib.blake2b( bytes( geometry.asWkb() ), digest_size=16 ).digest()
+
+    def get(self, source, fid, digest, crs_unit):
+        """
+        Return ( area, length ) or None
+        """
+        key = self._key( source, fid, digest, crs_unit )
+        row = self.conn.execute( self.SELECT, key ).fetchone()
+        if row is None:
+            return None
+
+        self.clock += 1
+        self.used[ key ] = self.clock
+        if len( self.used ) >= self.commitEvery:
+            self._writeUsed()
+            self.conn.commit()
+            self.pending = 0
+        return row
+
+    def put(self, source, fid, digest, crs_unit, area, length):
+        key = self._key( source, fid, digest, crs_unit )
+        isNew = self.conn.execute( self.SELECT, key ).fetchone() is None # REPLACE not counts the deleted row
+        self.clock += 1
+        self.used.pop( key, None )
+        self.conn.execute('INSERT OR REPLACE INTO measure VALUES ( ?, ?, ?, ?, ?, ?, ?, ?, ? )', key + ( area, length, self.clock ) )
+        if isNew:
+            self.rows += 1
+        if self.rows > self.maxRows:
+            self._evict()
+        self._written()
+
+    def invalidate(self, source, fid):
+        for key in [ key for key in self.used if key[0] == source and key[1] == fid ]:
+            del self.used[ key ]
+        cursor = self.conn.execute('DELETE FROM measure WHERE source = ? AND fid = ?', ( source, fid ) )
+        self.rows -= max( cursor.rowcount, 0 )
+        self._written()
+
+    def _key(self, source, fid, digest, crs_unit):
+        crs = 'auto' if crs_unit.get('auto') else ( crs_unit['crs'].authid() or crs_unit['crs'].toWkt() )
+        return ( source, fid, digest, crs, int( crs_unit['area'] ), int( crs_unit['length'] ) )
+
+    def _evict(self):
+        # Remove the least recently used 10%
+        self._writeUsed()
+        total = self.rows - int( self.maxRows * 0.9 )
+        self.conn.execute("""
+            DELETE FROM measure WHERE rowid IN (
+                SELECT rowid FROM measure ORDER BY used LIMIT ?
+            )
+        """, ( total, ) )
+        self.rows = self.conn.execute('SELECT COUNT(*) FROM measure').fetchone()[0]
+
+    def _writeUsed(self):
+        if not self.used:
+            return
+
+        self.conn.executemany( self.UPDATE_USED, ( ( clock, ) + key for key, clock in self.used.items() ) )
+        self.used.clear()
+
+    def _written(self):
+        self.pending += 1
+        if self.pending >= self.commitEvery:
+            self._writeUsed()
+            self.conn.commit()
+            self.pending = 0
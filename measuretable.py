@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Measure Table
+Description          : Dock with area and perimeter of features, measured on demand
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+from qgis.PyQt.QtCore import (
+    Qt,
+    QAbstractTableModel, QModelIndex,
+    QTimer,
+    pyqtSlot, pyqtSignal
+)
+from qgis.PyQt.QtWidgets import (
+    QDockWidget, QWidget,
+    QVBoxLayout,
+    QLineEdit,
+    QTableView, QHeaderView
+)
+
+from qgis.core import (
+    QgsApplication, QgsTask,
+    QgsMapLayerType, QgsWkbTypes,
+    QgsCoordinateTransform,
+    QgsFeatureRequest, QgsVectorLayerFeatureSource,
+    QgsExpression, QgsExpressionContext, QgsExpressionContextUtils
+)
+
+from .calcareaevent import BasePolygonEvent
+
+
+class FeaturesMeasureTask(QgsTask):
+    """
+    Result: { fid: ( area, length ) } in units of measure CRS
+    """
+    measured = pyqtSignal(int, dict)
+    def __init__(self, generation, serial, source, fids, ctLayer2Measure, autoCrs=None):
+        super().__init__( 'CalcArea2 measure table', QgsTask.CanCancel )
+        self.generation = generation
+        self.serial = serial # Start, for edits after snapshot of source
+        self.source = source
+        self.fids = fids
+        self.ctLayer2Measure = QgsCoordinateTransform( ctLayer2Measure )
+        self.autoCrs = autoCrs # AutoMeasureCrs of task
+        self.values = {}
+
+    def run(self):
+        request = QgsFeatureRequest().setFilterFids( self.fids ).setNoAttributes()
+        total = len( self.fids )
+        for id, feat in enumerate( self.source.getFeatures( request ) ):
+            if self.isCanceled():
+                return False
+            geom = feat.geometry()
+            ct = self.ctLayer2Measure
+            if not self.autoCrs is None and not geom.isEmpty():
+                ct = self.autoCrs.getByGeometry( ct.sourceCrs(), geom )
+            geom.transform( ct )
+            self.values[ feat.id() ] = ( geom.area(), geom.length() )
+            if id % 1000 == 0:
+                self.setProgress( 100.0 * id / total )
+
+        return True
+
+    def finished(self, result):
+        self.measured.emit( self.generation, self.values )
+
+
+class MeasureTableModel(QAbstractTableModel):
+    """
+    Rows(fids) are fetched by blocks when the view needs.
+    Measures are requested by data(visible rows) and computed in tasks by batch.
+    """
+    COLUMN_FID, COLUMN_AREA, COLUMN_PERIMETER = range(3)
+    def __init__(self, measureEvent, batchSize=500, fetchSize=1000):
+        super().__init__()
+        self.measureEvent = measureEvent # crs_unit, unitLabels, workerAutoCrs
+        self.batchSize = batchSize
+        self.fetchSize = fetchSize
+        self.headers = ( self.tr('Fid'), self.tr('Area'), self.tr('Perimeter') )
+        self.layer = None
+        self.expression = ''
+        self.ctLayer2Measure = None
+        self.fids = []
+        self.rows = None # fid: row, self._row
+        self.iterator = None # Not fetched fids
+        self.skipFids = set() # Added or deleted while fetching, the iterator is a snapshot
+        self.values = {} # fid: ( area, length )
+        self.requested = {} # fids to measure(ordered)
+        self.task = None
+        self.pendingSort = None # ( column, order ), waiting measures
+        self.generation = 0
+        self.serial = 0 # Order of starts of tasks and edits
+        self.editedFids = {} # fid: serial of edit, while the task is running
+        self.timer = QTimer()
+        self.timer.setSingleShot( True )
+        self.timer.setInterval( 0 )
+        self.timer.timeout.connect( self._measureRequested )
+
+    def setLayer(self, layer, expression=''):
+        signals = ( 'geometryChanged', 'featureAdded', 'featureDeleted' )
+        if not self.layer is None:
+            for signal in signals:
+                getattr( self.layer, signal ).disconnect( getattr( self, signal ) )
+        self.beginResetModel()
+        self.generation += 1
+        if not self.task is None:
+            self.task.cancel()
+        self.layer = layer
+        self.expression = expression
+        self.fids, self.rows, self.iterator = [], None, None
+        self.skipFids.clear()
+        self.editedFids.clear()
+        self.values.clear()
+        self.requested.clear()
+        self.pendingSort = None
+        if not layer is None:
+            for signal in signals:
+                getattr( layer, signal ).connect( getattr( self, signal ) )
+            self.ctLayer2Measure = QgsCoordinateTransform( layer.crs(), self.measureEvent.crs_unit['crs'], self.measureEvent.project )
+            request = QgsFeatureRequest().setFlags( QgsFeatureRequest.NoGeometry ).setNoAttributes()
+            if expression:
+                request.setFilterExpression( expression )
+            self.iterator = layer.getFeatures( request )
+        self.endResetModel()
+
+    def refreshMeasures(self):
+        # Units or CRS changed
+        self.setLayer( self.layer, self.expression )
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len( self.fids )
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len( self.headers )
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[ section ]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not role in ( Qt.DisplayRole, Qt.TextAlignmentRole ):
+            return None
+
+        if role == Qt.TextAlignmentRole:
+            return int( Qt.AlignRight | Qt.AlignVCenter )
+
+        fid = self.fids[ index.row() ]
+        column = index.column()
+        if column == self.COLUMN_FID:
+            return fid
+
+        if not fid in self.values:
+            self._request( fid )
+            return '...'
+
+        f_area, s_area, f_length, s_length = self.measureEvent.unitLabels
+        area, length = self.values[ fid ]
+        if column == self.COLUMN_AREA:
+            return f"{round( area * f_area, 2 )} {s_area}"
+        return f"{round( length * f_length, 2 )} {s_length}"
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.iterator is None
+
+    def fetchMore(self, parent=QModelIndex(), total=None):
+        if self.iterator is None:
+            return
+
+        total = self.fetchSize if total is None else total
+        fids = []
+        for feat in self.iterator:
+            fid = feat.id()
+            if fid in self.skipFids:
+                continue
+            fids.append( fid )
+            if len( fids ) == total:
+                break
+        if not len( fids ) == total:
+            self.iterator = None
+            self.skipFids.clear()
+        if not fids:
+            return
+
+        self.beginInsertRows( QModelIndex(), len( self.fids ), len( self.fids ) + len( fids ) - 1 )
+        self.fids.extend( fids )
+        self.rows = None
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        while self.canFetchMore():
+            self.fetchMore( total=10 * self.fetchSize )
+        if column == self.COLUMN_FID:
+            self._sort( column, order )
+            return
+
+        # Measures of all rows are need
+        missing = [ fid for fid in self.fids if not fid in self.values ]
+        if not missing:
+            self._sort( column, order )
+            return
+
+        self.pendingSort = ( column, order )
+        for fid in missing:
+            self.requested[ fid ] = None
+        self.timer.start()
+
+    @pyqtSlot('QgsFeatureId', 'QgsGeometry')
+    def geometryChanged(self, fid, geometry):
+        self.values.pop( fid, None )
+        self._setEdited( fid )
+        self._rowChanged( fid )
+
+    @pyqtSlot('QgsFeatureId')
+    def featureAdded(self, fid):
+        if self.expression:
+            feats = list( self.layer.getFeatures( QgsFeatureRequest( fid ).setFlags( QgsFeatureRequest.NoGeometry ) ) )
+            context = QgsExpressionContext( QgsExpressionContextUtils.globalProjectLayerScopes( self.layer ) )
+            if feats:
+                context.setFeature( feats[0] )
+            if not feats or not QgsExpression( self.expression ).evaluate( context ):
+                return
+
+        if not self.iterator is None: # Iterator can yield it
+            self.skipFids.add( fid )
+        row = len( self.fids )
+        self.beginInsertRows( QModelIndex(), row, row )
+        self.fids.append( fid )
+        if not self.rows is None:
+            self.rows[ fid ] = row
+        self.endInsertRows()
+
+    @pyqtSlot('QgsFeatureId')
+    def featureDeleted(self, fid):
+        self.values.pop( fid, None )
+        self.requested.pop( fid, None )
+        self._setEdited( fid )
+        if not self.iterator is None: # Iterator can yield it
+            self.skipFids.add( fid )
+        row = self._row( fid )
+        if row is None:
+            return
+
+        self.beginRemoveRows( QModelIndex(), row, row )
+        del self.fids[ row ]
+        self.rows = None
+        self.endRemoveRows()
+
+    @pyqtSlot(int, dict)
+    def measured(self, generation, values):
+        task = self.sender()
+        self.task = None
+        if not generation == self.generation:
+            self._measureRequested()
+            return
+
+        # Snapshot of task is stale for the features edited after its start
+        for fid, serial in self.editedFids.items():
+            if serial > task.serial and not values.pop( fid, None ) is None and not self._row( fid ) is None:
+                self.requested[ fid ] = None
+        self.editedFids.clear()
+
+        self.values.update( values )
+        rows = [ self._row( fid ) for fid in values ]
+        rows = [ row for row in rows if not row is None ]
+        if rows:
+            first = self.index( min( rows ), self.COLUMN_AREA )
+            last = self.index( max( rows ), self.COLUMN_PERIMETER )
+            self.dataChanged.emit( first, last, [ Qt.DisplayRole ] )
+
+        if self.requested:
+            self._measureRequested()
+            return
+
+        if not self.pendingSort is None:
+            column, order = self.pendingSort
+            self.pendingSort = None
+            self._sort( column, order )
+
+    def _sort(self, column, order):
+        def key(fid):
+            if column == self.COLUMN_FID:
+                return fid
+            area, length = self.values.get( fid, ( 0.0, 0.0 ) )
+            return area if column == self.COLUMN_AREA else length
+
+        self.layoutAboutToBeChanged.emit()
+        self.fids.sort( key=key, reverse=order == Qt.DescendingOrder )
+        self.rows = None
+        self.layoutChanged.emit()
+
+    def _row(self, fid):
+        if self.rows is None:
+            self.rows = { fid: row for row, fid in enumerate( self.fids ) }
+        return self.rows.get( fid )
+
+    def _rowChanged(self, fid):
+        row = self._row( fid )
+        if not row is None:
+            self.dataChanged.emit( self.index( row, self.COLUMN_AREA ), self.index( row, self.COLUMN_PERIMETER ), [ Qt.DisplayRole ] )
+
+    def _setEdited(self, fid):
+        if not self.task is None:
+            self.serial += 1
+            self.editedFids[ fid ] = self.serial
+
+    def _request(self, fid):
+        if fid in self.requested:
+            return
+        self.requested[ fid ] = None
+        self.timer.start()
+
+    @pyqtSlot()
+    def _measureRequested(self):
+        # One task running, batch of requested fids
+        if not self.task is None or not self.requested or self.layer is None:
+            return
+
+        fids = []
+        for fid in self.requested:
+            fids.append( fid )
+            if len( fids ) == self.batchSize:
+                break
+        for fid in fids:
+            del self.requested[ fid ]
+
+        source = QgsVectorLayerFeatureSource( self.layer )
+        self.serial += 1
+        args = ( self.generation, self.serial, source, fids, self.ctLayer2Measure, self.measureEvent.workerAutoCrs() )
+        self.task = FeaturesMeasureTask( *args )
+        self.task.measured.connect( self.measured )
+        QgsApplication.taskManager().addTask( self.task )
+
+
+class MeasureTableEvent(BasePolygonEvent):
+    """
+    Dock with table of measures of current polygon layer.
+    """
+    def __init__(self, iface, title):
+        super().__init__( iface.mapCanvas() )
+        self.iface = iface
+        self.model = MeasureTableModel( self )
+        self.dock = self._createDock( title )
+        self.iface.addDockWidget( Qt.RightDockWidgetArea, self.dock )
+        self.dock.hide()
+        self.iface.currentLayerChanged.connect( self.setLayer )
+
+    def release(self):
+        super().release()
+        self.iface.currentLayerChanged.disconnect( self.setLayer )
+        self.model.setLayer( None )
+        self.iface.removeDockWidget( self.dock )
+        self.dock.deleteLater()
+
+    def enable(self):
+        super().enable()
+        self.dock.show()
+        self.setLayer( self.mapCanvas.currentLayer() )
+
+    def disable(self):
+        super().disable()
+        self.dock.hide()
+        self.model.setLayer( None )
+
+    def setCrsUnit(self, crs_unit):
+        super().setCrsUnit( crs_unit )
+        if not self.model.layer is None:
+            self.model.refreshMeasures()
+
+    @pyqtSlot('QgsMapLayer*')
+    def setLayer(self, layer):
+        isValid = \
+            not layer is None and \
+            layer.type() == QgsMapLayerType.VectorLayer and \
+            layer.geometryType() == QgsWkbTypes.PolygonGeometry
+        if not self.isEnabled:
+            return
+
+        self.model.setLayer( layer if isValid else None, self.leFilter.text() if isValid else '' )
+        self.dock.setWindowTitle( f"{self.title} - {layer.name()}" if isValid else self.title )
+
+    @pyqtSlot()
+    def filterChanged(self):
+        if self.model.layer is None:
+            return
+
+        expression = self.leFilter.text()
+        if expression and QgsExpression( expression ).hasParserError():
+            self.iface.messageBar().pushCritical( self.title, QgsExpression( expression ).parserErrorString() )
+            return
+
+        self.model.setLayer( self.model.layer, expression )
+
+    def _createDock(self, title):
+        self.title = title
+        dock = QDockWidget( title, self.iface.mainWindow() )
+        dock.setObjectName('CalcArea2MeasureTable')
+        self.leFilter = QLineEdit()
+        self.leFilter.setPlaceholderText( dock.tr('Filter(expression)') )
+        self.leFilter.editingFinished.connect( self.filterChanged )
+        view = QTableView()
+        view.setModel( self.model )
+        view.setSortingEnabled( True ) # Sort by measure, computes all rows
+        view.horizontalHeader().setSectionResizeMode( QHeaderView.Stretch )
+        view.verticalHeader().hide()
+
+        lyt = QVBoxLayout()
+        lyt.addWidget( self.leFilter )
+        lyt.addWidget( view )
+        widget = QWidget()
+        widget.setLayout( lyt )
+        dock.setWidget( widget )
+        return dock
@@ -27,13 +27,14 @@ __revision__ = '$Format:%H$'
 
 import os
 
-from qgis.PyQt.QtCore import QObject, pyqtSlot 
+from qgis.PyQt.QtCore import QObject, QSettings, pyqtSlot 
 from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QAction, QToolButton, QMenu
+from qgis.PyQt.QtWidgets import QAction, QToolButton, QMenu, QFileDialog, QInputDialog
 
 from qgis.core import (
     QgsApplication,
-    QgsUnitTypes
+    QgsUnitTypes,
+    QgsMessageLog, Qgis
 )
 from qgis.gui import QgsMapTool
 
@@ -42,9 +43,15 @@ from .translate import Translate
 from .messageoutputhtml import messageOutputHtml
 
 from .calcareaevent import CalcAreaEvent
+from .hovermeasure import HoverMeasureEvent
+from .extentlabels import ExtentLabelEvent
+from .measuretable import MeasureTableEvent
+from .measurecache import MeasureCache
 
 from .dialog_setup import DialogSetup
 
+from .sessionrecorder import SessionRecorder, SessionReplay
+
 
 class CalcAreaPlugin(QObject):
     def __init__(self, iface):
@@ -64,6 +71,15 @@ class CalcAreaPlugin(QObject):
 
         self.tool = QgsMapTool( iface.mapCanvas() )
         self.toolEvent = CalcAreaEvent( self.iface )
+        self.hoverEvent = HoverMeasureEvent( self.iface )
+        self.extentLabelEvent = ExtentLabelEvent( self.iface )
+        self.tableEvent = MeasureTableEvent( self.iface, self.tr('{} - Measures').format( self.pluginName ) )
+        self.measureCache = None
+        self.settingCache = 'calcarea2/cache'
+        self.setMeasureCache( QSettings().value( self.settingCache, False, type=bool ) )
+        self.sessionRecorder = SessionRecorder( self.iface )
+        self.sessionReplay = SessionReplay( self.iface, self.toolEvent )
+        self.sessionReplay.finished.connect( self.replayFinished )
         # self.toolEvent.validLayer.connect( self.actions['tool'].setEnabled ) -> initGui
 
     def initGui(self):
@@ -81,10 +97,33 @@ class CalcAreaPlugin(QObject):
         self.actions['tool'] = createAction( icon, self.titleTool, self.runTool, self.toolTip, True )
         self.tool.setAction( self.actions['tool'] )
         self.toolEvent.validLayer.connect( self.actions['tool'].setEnabled )
+        # Action Multi layer
+        title = self.tr('Measure all editable layers')
+        icon = QgsApplication.getThemeIcon('/mActionToggleAllLayers.svg')
+        self.actions['multilayer'] = createAction( icon, title, self.runMultiLayer, isCheckable=True )
+        # Action Hover
+        title = self.tr('Hover measure')
+        icon = QgsApplication.getThemeIcon('/mActionIdentify.svg')
+        self.actions['hover'] = createAction( icon, title, self.runHover, isCheckable=True )
+        # Action Labels
+        title = self.tr('Label areas in view')
+        icon = QgsApplication.getThemeIcon('/labelingSingle.svg')
+        self.actions['labels'] = createAction( icon, title, self.runLabels, isCheckable=True )
+        # Action Table
+        title = self.tr('Measure table')
+        icon = QgsApplication.getThemeIcon('/mActionOpenTable.svg')
+        self.actions['table'] = createAction( icon, title, self.runTable, isCheckable=True )
         # Action Setup
         title = self.tr('Setup...')
         icon = QgsApplication.getThemeIcon('/propertyicons/general.svg')
         self.actions['setup'] = createAction( icon, title, self.runSetup )
+        # Action Session
+        title = self.tr('Record session...')
+        icon = QgsApplication.getThemeIcon('/mActionRecord.svg')
+        self.actions['record'] = createAction( icon, title, self.runRecord, isCheckable=True )
+        title = self.tr('Replay session...')
+        icon = QgsApplication.getThemeIcon('/mActionPlay.svg')
+        self.actions['replay'] = createAction( icon, title, self.runReplay )
         # Action About
         title = self.tr('About...')
         icon = QgsApplication.getThemeIcon('/mActionHelpContents.svg')
@@ -102,13 +141,68 @@ class CalcAreaPlugin(QObject):
             self.iface.removeToolBarIcon( action )
             self.iface.unregisterMainWindowAction( action )
         self.iface.removeToolBarIcon( self.toolBtnAction )
+        self.toolBtnAction.deleteLater() # Owns the tool button
         self.toolEvent.validLayer.disconnect( self.actions['tool'].setEnabled )
+        self.sessionRecorder.stop()
+        self.sessionReplay.stop()
+        self.sessionReplay.finished.disconnect( self.replayFinished )
+        self.toolEvent.release()
         del self.toolEvent
+        self.setMeasureCache( False )
+        self.hoverEvent.release()
+        del self.hoverEvent
+        self.extentLabelEvent.release()
+        del self.extentLabelEvent
+        self.tableEvent.release()
+        del self.tableEvent
+        # Actions are owned by main window
+        for action in self.actions.values():
+            action.triggered.disconnect()
+            action.deleteLater()
+        self.actions.clear()
+
+    def setMeasureCache(self, enabled):
+        if enabled == ( not self.measureCache is None ):
+            return
+
+        if enabled:
+            filepath = os.path.join( QgsApplication.qgisSettingsDirPath(), 'calcarea2', 'measures.sqlite' )
+            self.measureCache = MeasureCache( filepath )
+        else:
+            self.measureCache.close()
+            self.measureCache = None
+        self.hoverEvent.setMeasureCache( self.measureCache )
+        self.hoverEvent.setLayer( self.iface.mapCanvas().currentLayer() )
 
     @pyqtSlot(bool)
     def runTool(self, checked):
         self.toolEvent.run( checked )
 
+    @pyqtSlot(bool)
+    def runMultiLayer(self, checked):
+        self.toolEvent.setMultiLayer( checked )
+
+    @pyqtSlot(bool)
+    def runHover(self, checked):
+        if checked:
+            self.hoverEvent.enable()
+        else:
+            self.hoverEvent.disable()
+
+    @pyqtSlot(bool)
+    def runLabels(self, checked):
+        if checked:
+            self.extentLabelEvent.enable()
+        else:
+            self.extentLabelEvent.disable()
+
+    @pyqtSlot(bool)
+    def runTable(self, checked):
+        if checked:
+            self.tableEvent.enable()
+        else:
+            self.tableEvent.disable()
+
     @pyqtSlot(bool)
     def runSetup(self, checked):
         crs_unit = self.toolEvent.getCrsUnit()
@@ -123,6 +217,8 @@ class CalcAreaPlugin(QObject):
             'crs_current_layer': crs_current_layer,
             'area': crs_unit['area'],
             'length': crs_unit['length'],
+            'auto': crs_unit['auto'],
+            'cache': not self.measureCache is None,
             'parent': self.iface.mainWindow(),
             'title': self.pluginName
         }
@@ -130,6 +226,61 @@ class CalcAreaPlugin(QObject):
         if dlg.exec_() == dlg.Accepted:
             settings = dlg.currentData()
             self.toolEvent.setCrsUnit( settings )
+            self.hoverEvent.setCrsUnit( settings )
+            self.extentLabelEvent.setCrsUnit( settings )
+            self.tableEvent.setCrsUnit( settings )
+            QSettings().setValue( self.settingCache, settings['cache'] )
+            self.setMeasureCache( settings['cache'] )
+
+    @pyqtSlot(bool)
+    def runRecord(self, checked):
+        if not checked:
+            self.sessionRecorder.stop()
+            return
+
+        title = self.tr('{} - Record session')
+        title = title.format( self.pluginName )
+        filepath, _filter = QFileDialog.getSaveFileName( self.iface.mainWindow(), title, '', 'Session (*.ca2r)' )
+        if not filepath:
+            self.actions['record'].setChecked( False )
+            return
+
+        try:
+            self.sessionRecorder.start( filepath )
+        except OSError as e:
+            self.actions['record'].setChecked( False )
+            self.iface.messageBar().pushCritical( self.pluginName, str( e ) )
+
+    @pyqtSlot(bool)
+    def runReplay(self, checked):
+        title = self.tr('{} - Replay session')
+        title = title.format( self.pluginName )
+        filepath, _filter = QFileDialog.getOpenFileName( self.iface.mainWindow(), title, '', 'Session (*.ca2r)' )
+        if not filepath:
+            return
+
+        speeds = [ self.tr('Maximum speed'), self.tr('Original speed') ]
+        speed, ok = QInputDialog.getItem( self.iface.mainWindow(), title, self.tr('Speed'), speeds, 0, False )
+        if not ok:
+            return
+
+        try:
+            self.sessionReplay.start( filepath, speed == speeds[1] )
+        except TypeError as e:
+            self.iface.messageBar().pushCritical( self.pluginName, str( e ) )
+
+    @pyqtSlot(dict)
+    def replayFinished(self, report):
+        lines = []
+        for k, v in report.items():
+            if isinstance( v, dict ):
+                values = ', '.join( f"{key}={round( value, 3 )}" for key, value in v.items() )
+                lines.append( f"{k}: {values}" )
+            else:
+                lines.append( f"{k}: {v}" )
+        QgsMessageLog.logMessage( '\n'.join( lines ), self.pluginName, Qgis.Info )
+        msg = self.tr('Replay finished, latencies(ms) in log messages')
+        self.iface.messageBar().pushInfo( self.pluginName, msg )
 
     @pyqtSlot(bool)
     def runAbout(self, checked):
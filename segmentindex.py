@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Segment Index
+Description          : Grid index of segments for incremental intersection tests
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import math
+
+
+def segmentsIntersect(ax, ay, bx, by, cx, cy, dx, dy, isAdjacent=False):
+    """
+    Closed segments a-b and c-d.
+    isAdjacent: Segments are consecutive in ring(b == c or a == d ...),
+    they intersect only when overlap(back-tracking spike).
+    """
+    def orientation(px, py, qx, qy, rx, ry):
+        v = ( qx - px ) * ( ry - py ) - ( qy - py ) * ( rx - px )
+        return 0 if v == 0 else ( 1 if v > 0 else -1 )
+
+    def onSegment(px, py, qx, qy, rx, ry): # r collinear with p-q
+        return \
+            min( px, qx ) <= rx <= max( px, qx ) and \
+            min( py, qy ) <= ry <= max( py, qy )
+
+    o1 = orientation( ax, ay, bx, by, cx, cy )
+    o2 = orientation( ax, ay, bx, by, dx, dy )
+    o3 = orientation( cx, cy, dx, dy, ax, ay )
+    o4 = orientation( cx, cy, dx, dy, bx, by )
+
+    if isAdjacent:
+        # Overlap only when collinear, an end point, not shared, on other segment
+        if o1 or o2 or o3 or o4:
+            return False
+        for px, py in ( ( cx, cy ), ( dx, dy ) ):
+            isShared = ( px == ax and py == ay ) or ( px == bx and py == by )
+            if not isShared and onSegment( ax, ay, bx, by, px, py ):
+                return True
+        for px, py in ( ( ax, ay ), ( bx, by ) ):
+            isShared = ( px == cx and py == cy ) or ( px == dx and py == dy )
+            if not isShared and onSegment( cx, cy, dx, dy, px, py ):
+                return True
+        return False
+
+    if o1 != o2 and o3 != o4:
+        return True
+
+    if o1 == 0 and onSegment( ax, ay, bx, by, cx, cy ): return True
+    if o2 == 0 and onSegment( ax, ay, bx, by, dx, dy ): return True
+    if o3 == 0 and onSegment( cx, cy, dx, dy, ax, ay ): return True
+    if o4 == 0 and onSegment( cx, cy, dx, dy, bx, by ): return True
+
+    return False
+
+
+class SegmentGrid():
+    """
+    Uniform grid of segments, a segment is kept in the cells that it crosses.
+    The cell size follows the mean extent of segments, the grid is rebuilt when the mean
+    drifts more than 'drift' times from cell size.
+    Segments crossing more than 'maxCells' are kept in a set always tested.
+    """
+    def __init__(self, maxCells=64, drift=4.0):
+        self.maxCells = maxCells
+        self.drift = drift
+        self.clear()
+
+    def clear(self):
+        self.cellSize = None
+        self.cells = {} # (col, row): set(ids)
+        self.segments = {} # id: ( x1, y1, x2, y2, cells )
+        self.large = set()
+        self.totalExtent = 0.0 # Sum of extent of segments, for mean
+
+    def __len__(self):
+        return len( self.segments )
+
+    def add(self, id, x1, y1, x2, y2):
+        self.totalExtent += max( abs( x2 - x1 ), abs( y2 - y1 ) )
+        self.segments[ id ] = ( x1, y1, x2, y2, None )
+        mean = self.totalExtent / len( self.segments )
+        if self.cellSize is None or not self.cellSize / self.drift <= mean <= self.cellSize * self.drift:
+            self._rebuild( mean )
+            return
+
+        self._insert( id )
+
+    def remove(self, id):
+        if not id in self.segments:
+            return
+
+        x1, y1, x2, y2, cells = self.segments.pop( id )
+        self.totalExtent -= max( abs( x2 - x1 ), abs( y2 - y1 ) )
+        if not self.segments:
+            self.clear()
+            return
+
+        if cells is None:
+            self.large.discard( id )
+            return
+
+        for cell in cells:
+            ids = self.cells[ cell ]
+            ids.discard( id )
+            if not ids:
+                del self.cells[ cell ]
+
+    def segment(self, id):
+        x1, y1, x2, y2, _cells = self.segments[ id ]
+        return x1, y1, x2, y2
+
+    def intersects(self, x1, y1, x2, y2, adjacentIds=()):
+        """
+        adjacentIds: Segments consecutive in ring, see segmentsIntersect
+        """
+        for id in self.large:
+            if self._intersects( id, x1, y1, x2, y2, adjacentIds ):
+                return True
+
+        if self.cellSize is None:
+            return False
+
+        limit = len( self.segments ) - len( self.large )
+        total = 0
+        for cell in self._crossed( x1, y1, x2, y2 ):
+            total += 1
+            if total > limit: # Test all segments is cheaper
+                return self._intersectsAll( x1, y1, x2, y2, adjacentIds )
+            ids = self.cells.get( cell )
+            if ids is None:
+                continue
+            for id in ids:
+                if self._intersects( id, x1, y1, x2, y2, adjacentIds ):
+                    return True
+
+        return False
+
+    def _intersects(self, id, x1, y1, x2, y2, adjacentIds):
+        q = self.segments[ id ]
+        return segmentsIntersect( x1, y1, x2, y2, q[0], q[1], q[2], q[3], id in adjacentIds )
+
+    def _intersectsAll(self, x1, y1, x2, y2, adjacentIds):
+        for id in self.segments:
+            if self._intersects( id, x1, y1, x2, y2, adjacentIds ):
+                return True
+
+        return False
+
+    def _rebuild(self, mean):
+        if mean > 0:
+            self.cellSize = mean
+        elif self.cellSize is None:
+            self.cellSize = 1.0
+        self.cells.clear()
+        self.large.clear()
+        for id in self.segments:
+            self._insert( id )
+
+    def _insert(self, id):
+        x1, y1, x2, y2, _cells = self.segments[ id ]
+        cells = []
+        for cell in self._crossed( x1, y1, x2, y2 ):
+            cells.append( cell )
+            if len( cells ) > self.maxCells:
+                cells = None
+                break
+        self.segments[ id ] = ( x1, y1, x2, y2, cells )
+        if cells is None:
+            self.large.add( id )
+            return
+
+        for cell in cells:
+            ids = self.cells.get( cell )
+            if ids is None:
+                ids = self.cells[ cell ] = set()
+            ids.add( id )
+
+    def _crossed(self, x1, y1, x2, y2):
+        """
+        Cells crossed by segment, by column.
+        Rows have a margin for rounding, limited by rows of end points.
+        """
+        size = self.cellSize
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        col1, col2 = math.floor( x1 / size ), math.floor( x2 / size )
+        rowMin = math.floor( min( y1, y2 ) / size )
+        rowMax = math.floor( max( y1, y2 ) / size )
+        if col1 == col2:
+            for row in range( rowMin, rowMax + 1 ):
+                yield ( col1, row )
+            return
+
+        slope = ( y2 - y1 ) / ( x2 - x1 )
+        margin = 1e-12 * ( ( abs( x1 ) + abs( x2 ) ) * ( 1 + abs( slope ) ) + abs( y1 ) + abs( y2 ) ) + 1e-9 * size
+        for col in range( col1, col2 + 1 ):
+            ya = y1 + ( max( x1, col * size ) - x1 ) * slope
+            yb = y1 + ( min( x2, ( col + 1 ) * size ) - x1 ) * slope
+            if ya > yb:
+                ya, yb = yb, ya
+            row1 = max( math.floor( ( ya - margin ) / size ), rowMin )
+            row2 = min( math.floor( ( yb + margin ) / size ), rowMax )
+            for row in range( row1, row2 + 1 ):
+                yield ( col, row )
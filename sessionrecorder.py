@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Session Recorder
+Description          : Record and replay canvas events handled by Calc Area 2
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+File format(little endian):
+  Header: b'CA2R' + version(uint16)
+  Record: kind(uint8) + delta of time from previous record(uint32, microseconds) + data
+    CONTEXT: extent(4 x double) + length(uint16) + utf-8 'tool<US>layer crs'
+    MOUSE_MOVE, MOUSE_RELEASE: x, y(float, canvas pixels) + button(uint8) + buttons(uint8) + modifiers(uint32)
+    KEY_RELEASE: key(int32) + modifiers(uint32)
+  The records are flushed each second, a crash while recording truncates only the last record.
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import struct, time
+
+from qgis.PyQt.QtCore import (
+    Qt,
+    QObject,
+    QEvent,
+    QPointF,
+    QTimer,
+    pyqtSlot, pyqtSignal
+)
+from qgis.PyQt.QtGui import QMouseEvent, QKeyEvent
+from qgis.PyQt.QtWidgets import QAction
+
+from qgis.core import QgsRectangle
+from qgis.gui import QgsMapTool
+
+
+MAGIC = b'CA2R'
+VERSION = 1
+
+CONTEXT, MOUSE_MOVE, MOUSE_RELEASE, KEY_RELEASE = range( 4 )
+
+HEADER = struct.Struct('<4sH')
+RECORD = struct.Struct('<BI')
+DATA = {
+    CONTEXT: struct.Struct('<ddddH'),
+    MOUSE_MOVE: struct.Struct('<ffBBI'),
+    MOUSE_RELEASE: struct.Struct('<ffBBI'),
+    KEY_RELEASE: struct.Struct('<iI')
+}
+SEPARATOR = '\x1f'
+FLUSH_NS = 1000000000 # Interval of flush of records
+
+
+def readSession(filepath):
+    """
+    Return ( records, isTruncated ), records: list of ( kind, delta_us, data )
+    data: CONTEXT: ( QgsRectangle, tool name, layer crs authid ), others: tuple of DATA
+    isTruncated: Last record incomplete(recording not stopped), it is ignored
+    Raise TypeError when the file is not a valid session
+    """
+    try:
+        with open( filepath, 'rb' ) as reader:
+            content = reader.read()
+    except OSError as e:
+        raise TypeError(f"File '{filepath}': {e.strerror}")
+
+    if len( content ) < HEADER.size:
+        raise TypeError(f"File '{filepath}' is not a Calc Area 2 session")
+    magic, version = HEADER.unpack_from( content, 0 )
+    if not magic == MAGIC or version > VERSION:
+        raise TypeError(f"File '{filepath}' is not a Calc Area 2 session")
+
+    records = []
+    total = len( content )
+    offset = HEADER.size
+    while offset < total:
+        if offset + RECORD.size > total:
+            return records, True
+        kind, delta = RECORD.unpack_from( content, offset )
+        if not kind in DATA:
+            raise TypeError(f"File '{filepath}' has unknown record({kind}) at byte {offset}")
+        end = offset + RECORD.size + DATA[ kind ].size
+        if end > total:
+            return records, True
+        data = DATA[ kind ].unpack_from( content, offset + RECORD.size )
+        if kind == CONTEXT:
+            size = data[-1]
+            if end + size > total:
+                return records, True
+            try:
+                tool, authid = content[ end:end + size ].decode('utf-8').split( SEPARATOR )
+            except ValueError:
+                raise TypeError(f"File '{filepath}' has invalid context at byte {offset}")
+            end += size
+            data = ( QgsRectangle( *data[:4] ), tool, authid )
+        records.append( ( kind, delta, data ) )
+        offset = end
+
+    return records, False
+
+
+class SessionRecorder(QObject):
+    def __init__(self, iface):
+        super().__init__()
+        self.iface = iface
+        self.mapCanvas = iface.mapCanvas()
+        self.writer = None
+        self.lastTime = None
+        self.lastFlush = None
+        self.handlers = {
+            QEvent.MouseMove: self._mouseMove,
+            QEvent.MouseButtonRelease: self._mouseRelease,
+            QEvent.KeyRelease: self._keyRelease
+        }
+
+    def isRecording(self):
+        return not self.writer is None
+
+    def start(self, filepath):
+        """
+        Raise OSError if the file can not be written
+        """
+        if self.isRecording():
+            self.stop()
+
+        writer = open( filepath, 'wb' )
+        try:
+            writer.write( HEADER.pack( MAGIC, VERSION ) )
+        except OSError:
+            writer.close()
+            raise
+        self.writer = writer
+        self.lastTime = self.lastFlush = time.perf_counter_ns()
+        self.writeContext()
+
+        self.mapCanvas.mapToolSet.connect( self.writeContext )
+        self.mapCanvas.extentsChanged.connect( self.writeContext )
+        self.iface.currentLayerChanged.connect( self.writeContext )
+        for obj in ( self.mapCanvas, self.mapCanvas.viewport() ):
+            obj.installEventFilter( self )
+
+    def stop(self):
+        if not self.isRecording():
+            return
+
+        for obj in ( self.mapCanvas, self.mapCanvas.viewport() ):
+            obj.removeEventFilter( self )
+        self.mapCanvas.mapToolSet.disconnect( self.writeContext )
+        self.mapCanvas.extentsChanged.disconnect( self.writeContext )
+        self.iface.currentLayerChanged.disconnect( self.writeContext )
+
+        self.writer.close()
+        self.writer = None
+
+    @pyqtSlot()
+    def writeContext(self):
+        mapTool = self.mapCanvas.mapTool()
+        action = mapTool.action() if isinstance( mapTool, QgsMapTool ) else None
+        tool = '' if action is None else action.objectName()
+        layer = self.mapCanvas.currentLayer()
+        authid = '' if layer is None else layer.crs().authid()
+        text = f"{tool}{SEPARATOR}{authid}".encode('utf-8')
+        e = self.mapCanvas.extent()
+        data = DATA[ CONTEXT ].pack( e.xMinimum(), e.yMinimum(), e.xMaximum(), e.yMaximum(), len( text ) )
+        self._write( CONTEXT, data + text )
+
+    @pyqtSlot(QObject, QEvent)
+    def eventFilter(self, watched, event):
+        handler = self.handlers.get( event.type() )
+        if not handler is None:
+            handler( event )
+
+        return False
+
+    def _write(self, kind, data):
+        now = time.perf_counter_ns()
+        delta = min( ( now - self.lastTime ) // 1000, 0xFFFFFFFF )
+        self.lastTime = now
+        self.writer.write( RECORD.pack( kind, delta ) + data )
+        if now - self.lastFlush >= FLUSH_NS:
+            self.writer.flush()
+            self.lastFlush = now
+
+    def _mouse(self, kind, event):
+        pos = event.localPos()
+        data = DATA[ kind ].pack( pos.x(), pos.y(), int( event.button() ), int( event.buttons() ), int( event.modifiers() ) )
+        self._write( kind, data )
+
+    def _mouseMove(self, event):
+        self._mouse( MOUSE_MOVE, event )
+
+    def _mouseRelease(self, event):
+        self._mouse( MOUSE_RELEASE, event )
+
+    def _keyRelease(self, event):
+        data = DATA[ KEY_RELEASE ].pack( event.key(), int( event.modifiers() ) )
+        self._write( KEY_RELEASE, data )
+
+
+class SessionReplay(QObject):
+    """
+    Feed the recorded events to the current event of CalcAreaEvent.
+    Only canvas events are replayed: the edits of layers are not recorded, for ChangeGeometryEvent
+    only the mouse move(remove annotation) is replayed, not geometryChanged.
+    finished: Report with latency(milliseconds) by kind of event
+    """
+    finished = pyqtSignal(dict)
+    def __init__(self, iface, calcAreaEvent):
+        super().__init__()
+        self.iface = iface
+        self.mapCanvas = iface.mapCanvas()
+        self.calcAreaEvent = calcAreaEvent
+        self.records = []
+        self.position = 0
+        self.isOriginalSpeed = False
+        self.latencies = {} # kind: [ ms ]
+        self.skipped = 0
+        self.isTruncated = False
+        self.crsMismatch = set()
+        self.builders = {
+            MOUSE_MOVE: ( lambda data: self._mouseEvent( QEvent.MouseMove, data ), self.mapCanvas.viewport() ),
+            MOUSE_RELEASE: ( lambda data: self._mouseEvent( QEvent.MouseButtonRelease, data ), self.mapCanvas.viewport() ),
+            KEY_RELEASE: ( self._keyEvent, self.mapCanvas )
+        }
+
+    def isRunning(self):
+        return self.position < len( self.records )
+
+    def start(self, filepath, isOriginalSpeed=False):
+        self.records, self.isTruncated = readSession( filepath )
+        self.position = 0
+        self.isOriginalSpeed = isOriginalSpeed
+        self.latencies = { kind: [] for kind in self.builders }
+        self.skipped = 0
+        self.crsMismatch.clear()
+        if isOriginalSpeed:
+            QTimer.singleShot( 0, self._next )
+            return
+
+        while self.isRunning():
+            self._play( self.records[ self.position ] )
+            self.position += 1
+        self._finish()
+
+    def stop(self):
+        self.records = []
+        self.position = 0
+
+    @pyqtSlot()
+    def _next(self):
+        if not self.isRunning():
+            return
+
+        self._play( self.records[ self.position ] )
+        self.position += 1
+        if not self.isRunning():
+            self._finish()
+            return
+
+        delay = self.records[ self.position ][1] // 1000
+        QTimer.singleShot( delay, self._next )
+
+    def _play(self, record):
+        kind, _delta, data = record
+        if kind == CONTEXT:
+            self._setContext( *data )
+            return
+
+        event = self.calcAreaEvent.currentEvent
+        if event is None or not event.isEventFiltered:
+            self.skipped += 1
+            return
+
+        build, watched = self.builders[ kind ]
+        qevent = build( data )
+        t0 = time.perf_counter_ns()
+        event.eventFilter( watched, qevent )
+        self.latencies[ kind ].append( ( time.perf_counter_ns() - t0 ) / 1e6 )
+
+    def _setContext(self, extent, tool, authid):
+        if not self.mapCanvas.extent() == extent:
+            self.mapCanvas.setExtent( extent )
+
+        mapTool = self.mapCanvas.mapTool()
+        action = mapTool.action() if isinstance( mapTool, QgsMapTool ) else None
+        if tool and ( action is None or not action.objectName() == tool ):
+            action = self.iface.mainWindow().findChild( QAction, tool )
+            if not action is None:
+                action.trigger()
+
+        layer = self.mapCanvas.currentLayer()
+        if authid and ( layer is None or not layer.crs().authid() == authid ):
+            self.crsMismatch.add( authid )
+
+    def _mouseEvent(self, e_type, data):
+        x, y, button, buttons, modifiers = data
+        return QMouseEvent( e_type, QPointF( x, y ), Qt.MouseButton( button ), Qt.MouseButtons( buttons ), Qt.KeyboardModifiers( modifiers ) )
+
+    def _keyEvent(self, data):
+        key, modifiers = data
+        return QKeyEvent( QEvent.KeyRelease, key, Qt.KeyboardModifiers( modifiers ) )
+
+    def _finish(self):
+        def statistics(values):
+            if not values:
+                return { 'count': 0 }
+            values = sorted( values )
+            total = len( values )
+            return {
+                'count': total,
+                'mean': sum( values ) / total,
+                'p50': values[ total // 2 ],
+                'p95': values[ min( int( total * 0.95 ), total - 1 ) ],
+                'max': values[-1]
+            }
+
+        names = { MOUSE_MOVE: 'mouse_move', MOUSE_RELEASE: 'mouse_release', KEY_RELEASE: 'key_release' }
+        report = { names[ kind ]: statistics( self.latencies[ kind ] ) for kind in self.latencies }
+        report['skipped'] = self.skipped
+        report['truncated'] = self.isTruncated
+        report['crs_mismatch'] = sorted( self.crsMismatch )
+        self.stop()
+        self.finished.emit( report )
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of Calc Area 2, run from plugin directory: python -m pytest -q
+Tests that need QGIS are skipped when it is not available.
+"""
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Benchmark event filter
+Description          : Overhead by canvas event, filter installed or not
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Run, with QGIS python: python test/benchmark_eventfilter.py [total of events]
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import os, sys, time, importlib
+
+
+def pluginModule(name):
+    # Plugin directory as package, for relative imports of plugin
+    pluginDir = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+    parentDir = os.path.dirname( pluginDir )
+    if not parentDir in sys.path:
+        sys.path.insert( 0, parentDir )
+    return importlib.import_module( f"{os.path.basename( pluginDir )}.{name}" )
+
+
+def nanoseconds(f_event, total):
+    # Mean by event
+    t0 = time.perf_counter_ns()
+    for _ in range( total ):
+        f_event()
+    return ( time.perf_counter_ns() - t0 ) / total
+
+
+def main(total=200000):
+    app = pluginModule('test.utilities').getQgisApp()
+
+    from qgis.PyQt.QtCore import Qt, QEvent, QPointF, QCoreApplication
+    from qgis.PyQt.QtGui import QMouseEvent
+    from qgis.PyQt.QtWidgets import QWidget
+
+    BasePolygonEvent = pluginModule('calcareaevent').BasePolygonEvent
+
+    class MoveEvent(BasePolygonEvent):
+        def __init__(self, mapCanvas):
+            super().__init__( mapCanvas )
+            self.objsToggleFilter = [ mapCanvas ]
+            self.eventHandlers = { QEvent.MouseMove: self._mouseMove }
+            self.total = 0
+
+        def _mouseMove(self, event):
+            if not self.isEnabled:
+                return
+            self.total += 1
+
+    widget = QWidget()
+    polygonEvent = MoveEvent( widget )
+    ignored = QEvent( QEvent.User ) # Not handled by widget or plugin
+    move = QMouseEvent( QEvent.MouseMove, QPointF( 10, 10 ), Qt.NoButton, Qt.NoButton, Qt.NoModifier )
+
+    rows = []
+    rows.append( ( 'sendEvent, filter not installed', nanoseconds( lambda: QCoreApplication.sendEvent( widget, ignored ), total ) ) )
+    polygonEvent.setEventFilter( True )
+    rows.append( ( 'sendEvent, filter installed, ignored event', nanoseconds( lambda: QCoreApplication.sendEvent( widget, ignored ), total ) ) )
+    polygonEvent.setEventFilter( False )
+    rows.append( ( 'eventFilter, ignored event', nanoseconds( lambda: polygonEvent.eventFilter( widget, ignored ), total ) ) )
+    rows.append( ( 'eventFilter, mouse move, disabled', nanoseconds( lambda: polygonEvent.eventFilter( widget, move ), total ) ) )
+    polygonEvent.enable()
+    rows.append( ( 'eventFilter, mouse move, enabled', nanoseconds( lambda: polygonEvent.eventFilter( widget, move ), total ) ) )
+    polygonEvent.release()
+
+    width = max( len( name ) for name, _ns in rows )
+    print( f"{'Case'.ljust( width )}  ns/event" )
+    for name, ns in rows:
+        print( f"{name.ljust( width )}  {ns:8.1f}" )
+    return app
+
+
+if __name__ == '__main__':
+    main( int( sys.argv[1] ) if len( sys.argv ) > 1 else 200000 )
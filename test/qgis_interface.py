@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : QGIS interface for tests
+Description          : QgisInterface and canvas that count event filters and connections
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+from qgis.PyQt.QtCore import QObject, pyqtSignal
+from qgis.PyQt.QtWidgets import QWidget, QMainWindow, QToolBar, QAction
+
+from qgis.core import QgsProject
+from qgis.gui import QgsMapCanvas, QgsMapTool, QgsMessageBar
+
+
+class FilterCounter():
+    """
+    Keep the event filters installed from Python, mixin of QObject
+    """
+    def initCounter(self):
+        self.filters = []
+        self.totalInstalled = 0
+        self.totalRemoved = 0
+
+    def installEventFilter(self, obj):
+        self.totalInstalled += 1
+        if not any( f is obj for f in self.filters ): # Qt not duplicate
+            self.filters.append( obj )
+        super().installEventFilter( obj )
+
+    def removeEventFilter(self, obj):
+        self.totalRemoved += 1
+        self.filters = [ f for f in self.filters if not f is obj ]
+        super().removeEventFilter( obj )
+
+
+class CountingWidget(FilterCounter, QWidget):
+    def __init__(self, parent=None):
+        super().__init__( parent )
+        self.initCounter()
+
+
+class CountingCanvas(FilterCounter, QgsMapCanvas):
+    """
+    viewport: CountingWidget, only for the calls from Python
+    """
+    def __init__(self, parent=None):
+        super().__init__( parent )
+        self.initCounter()
+        self.countingViewport = CountingWidget( self )
+
+    def viewport(self):
+        return self.countingViewport
+
+
+class EditTool(QgsMapTool):
+    """
+    Edit map tool with action of QGIS name
+    """
+    def __init__(self, mapCanvas, actionName):
+        super().__init__( mapCanvas )
+        action = QAction( actionName, mapCanvas )
+        action.setObjectName( actionName )
+        self.setAction( action )
+
+    def flags(self):
+        return QgsMapTool.EditTool
+
+
+class QgisInterface(QObject):
+    """
+    Only the methods used by plugin
+    """
+    currentLayerChanged = pyqtSignal('QgsMapLayer*')
+    def __init__(self):
+        super().__init__()
+        self.window = QMainWindow()
+        self.canvas = CountingCanvas( self.window )
+        self.canvas.setDestinationCrs( QgsProject.instance().crs() )
+        self.toolBar = QToolBar( self.window )
+        self.digitizeToolBar = QToolBar( self.window )
+        action = QAction( 'Digitize with curve', self.digitizeToolBar )
+        action.setObjectName('mActionDigitizeWithCurve')
+        action.setCheckable( True )
+        self.digitizeToolBar.addAction( action )
+        self.bar = QgsMessageBar( self.window )
+        self.menus = {} # name: [ QAction ]
+
+    def setCurrentLayer(self, layer):
+        self.canvas.setCurrentLayer( layer )
+        self.currentLayerChanged.emit( layer )
+
+    def mapCanvas(self):
+        return self.canvas
+
+    def mainWindow(self):
+        return self.window
+
+    def messageBar(self):
+        return self.bar
+
+    def advancedDigitizeToolBar(self):
+        return self.digitizeToolBar
+
+    def addToolBarWidget(self, widget):
+        return self.toolBar.addWidget( widget )
+
+    def removeToolBarIcon(self, action):
+        self.toolBar.removeAction( action )
+
+    def addPluginToVectorMenu(self, name, action):
+        self.menus.setdefault( name, [] ).append( action )
+
+    def removePluginVectorMenu(self, name, action):
+        actions = self.menus.get( name, [] )
+        if action in actions:
+            actions.remove( action )
+        if not actions:
+            self.menus.pop( name, None )
+
+    def unregisterMainWindowAction(self, action):
+        return True
+
+    def addDockWidget(self, area, dock):
+        self.window.addDockWidget( area, dock )
+
+    def removeDockWidget(self, dock):
+        self.window.removeDockWidget( dock )
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test Hot path budget
+Description          : Allocations of mouse move while digitizing
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import math, unittest, tracemalloc
+
+from .utilities import HAS_QGIS, getQgisApp
+
+if HAS_QGIS:
+    from qgis.PyQt.QtCore import Qt, QEvent, QPointF
+    from qgis.PyQt.QtGui import QMouseEvent
+    from qgis.core import QgsProject, QgsVectorLayer, QgsPointXY
+
+    from .qgis_interface import QgisInterface
+    from ..calcareaevent import CalcAreaEvent
+
+
+@unittest.skipUnless( HAS_QGIS, 'QGIS not available' )
+class TestHotPathBudget(unittest.TestCase):
+    """
+    Mouse move, by AddFeatureEvent.eventFilter, not retain memory and its transient allocations(Python) are bounded.
+    The path still allocates: transformed point, measures, label text and the values of publish.
+    """
+    MOVES = 5000
+    VERTICES = 200
+    GROWTH = 1 # Bytes by move, retained
+    PEAK = 16384 # Bytes, transient of one move
+
+    @classmethod
+    def setUpClass(cls):
+        getQgisApp()
+        cls.iface = QgisInterface()
+        cls.layer = QgsVectorLayer( 'Polygon?crs=EPSG:3857', 'polygons', 'memory' )
+        QgsProject.instance().addMapLayer( cls.layer )
+        cls.iface.mapCanvas().setLayers( [ cls.layer ] )
+        cls.iface.setCurrentLayer( cls.layer )
+
+    @classmethod
+    def tearDownClass(cls):
+        QgsProject.instance().removeMapLayer( cls.layer.id() )
+
+    def setUp(self):
+        self.calcEvent = CalcAreaEvent( self.iface )
+        self.event = self.calcEvent.addFeatureEvent
+        self.event.isValidLayer = True
+        self.event.enable()
+        # Spiral, without self-intersection
+        for id in range( self.VERTICES ):
+            radius = 100.0 + id
+            angle = id * 0.3
+            self.event.geomPolygon.add( QgsPointXY( radius * math.cos( angle ), radius * math.sin( angle ) ) )
+        self.viewport = self.iface.mapCanvas().viewport()
+        self.mouseEvents = [
+            QMouseEvent( QEvent.MouseMove, QPointF( 10.0 + id * 7, 20.0 + id * 5 ), Qt.NoButton, Qt.NoButton, Qt.NoModifier )
+            for id in range( 64 )
+        ]
+        self.total = 0
+
+    def tearDown(self):
+        self.calcEvent.release()
+
+    def _moves(self, total):
+        viewport, mouseEvents, eventFilter = self.viewport, self.mouseEvents, self.event.eventFilter
+        for id in range( total ):
+            eventFilter( viewport, mouseEvents[ id & 63 ] )
+
+    def _assertBudget(self):
+        self._moves( 500 ) # Warm up: caches and annotation
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            start, _peak = tracemalloc.get_traced_memory()
+            self._moves( self.MOVES )
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLessEqual( ( current - start ) / self.MOVES, self.GROWTH )
+        self.assertLessEqual( peak - start, self.PEAK )
+
+    def _slotMeasured(self, *args):
+        self.total += 1
+
+    def test_move_without_listener(self):
+        self._assertBudget()
+
+    def test_move_with_listener(self):
+        self.calcEvent.measured.connect( self._slotMeasured )
+        self._assertBudget()
+        self.calcEvent.publisher.flush()
+        self.assertGreater( self.total, 0 )
+        self.calcEvent.measured.disconnect( self._slotMeasured )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test Lifecycle
+Description          : Load, toggle tools and unload plugin without leaks
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import gc, unittest
+
+from .utilities import HAS_QGIS, getQgisApp
+
+if HAS_QGIS:
+    from qgis.PyQt.QtCore import QEvent, QCoreApplication
+    from qgis.PyQt.QtWidgets import QAction, QDockWidget, QToolButton
+    from qgis.core import QgsApplication, QgsProject, QgsVectorLayer
+    from qgis.gui import QgsMapToolPan
+
+    from .qgis_interface import QgisInterface, EditTool
+    from ..plugin import CalcAreaPlugin
+
+
+@unittest.skipUnless( HAS_QGIS, 'QGIS not available' )
+class TestLifecycle(unittest.TestCase):
+    LOADS = 200
+    TOGGLES = 20 # By load, even: actions end unchecked
+    actionNames = ( 'tool', 'multilayer', 'hover', 'labels', 'table' )
+
+    @classmethod
+    def setUpClass(cls):
+        getQgisApp()
+        cls.iface = QgisInterface()
+        cls.layer = QgsVectorLayer( 'Polygon?crs=EPSG:3857', 'polygons', 'memory' )
+        QgsProject.instance().addMapLayer( cls.layer )
+        canvas = cls.iface.mapCanvas()
+        canvas.setLayers( [ cls.layer ] )
+        cls.iface.setCurrentLayer( cls.layer )
+        names = ( 'mActionAddFeature', 'mActionVertexTool', 'mActionSplitFeatures', 'mActionReshapeFeatures' )
+        cls.tools = [ EditTool( canvas, name ) for name in names ] + [ QgsMapToolPan( canvas ) ]
+        cls.package = CalcAreaPlugin.__module__.rsplit( '.', 1 )[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.iface.mapCanvas().unsetMapTool( cls.iface.mapCanvas().mapTool() )
+        QgsProject.instance().removeMapLayer( cls.layer.id() )
+
+    def _settle(self):
+        # Tasks finished and objects deleted
+        taskManager = QgsApplication.taskManager()
+        while taskManager.countActiveTasks():
+            QCoreApplication.processEvents()
+        QCoreApplication.processEvents()
+        QCoreApplication.sendPostedEvents( None, QEvent.DeferredDelete )
+        gc.collect()
+
+    def _state(self):
+        self._settle()
+        iface, canvas, layer = self.iface, self.iface.mapCanvas(), self.layer
+        curve = iface.advancedDigitizeToolBar().actions()[0]
+        window = iface.mainWindow()
+        return {
+            'canvas filters': len( canvas.filters ),
+            'viewport filters': len( canvas.viewport().filters ),
+            'iface currentLayerChanged': iface.receivers( iface.currentLayerChanged ),
+            'canvas mapToolSet': canvas.receivers( canvas.mapToolSet ),
+            'canvas extentsChanged': canvas.receivers( canvas.extentsChanged ),
+            'curve toggled': curve.receivers( curve.toggled ),
+            'layer geometryChanged': layer.receivers( layer.geometryChanged ),
+            'layer featureAdded': layer.receivers( layer.featureAdded ),
+            'layer featureDeleted': layer.receivers( layer.featureDeleted ),
+            'annotations': len( QgsProject.instance().annotationManager().annotations() ),
+            'canvas items': len( canvas.scene().items() ),
+            'actions': len( window.findChildren( QAction ) ),
+            'tool buttons': len( window.findChildren( QToolButton ) ),
+            'docks': len( window.findChildren( QDockWidget ) ),
+            'plugin objects': sum( 1 for obj in gc.get_objects() if type( obj ).__module__.startswith( self.package ) )
+        }
+
+    def _toggle(self, plugin, id):
+        self.iface.mapCanvas().setMapTool( self.tools[ id % len( self.tools ) ] )
+        self.iface.setCurrentLayer( None if id % 3 == 2 else self.layer )
+        for name in self.actionNames:
+            plugin.actions[ name ].trigger()
+
+    def test_load_unload(self):
+        baseline = None
+        for load in range( self.LOADS ):
+            plugin = CalcAreaPlugin( self.iface )
+            plugin.initGui()
+            for id in range( self.TOGGLES ):
+                self._toggle( plugin, id )
+                canvas = self.iface.mapCanvas()
+                self.assertLessEqual( len( canvas.filters ), 1 ) # Only current event
+                self.assertLessEqual( len( canvas.viewport().filters ), 2 ) # Current event and hover
+            self.iface.setCurrentLayer( self.layer )
+            for name in self.actionNames:
+                self.assertFalse( plugin.actions[ name ].isChecked() )
+            self.assertFalse( self.iface.mapCanvas().filters, f"Load {load}: filter of disabled events" )
+            plugin.unload()
+            del plugin
+
+            state = self._state()
+            self.assertEqual( state['canvas filters'], 0 )
+            self.assertEqual( state['viewport filters'], 0 )
+            if baseline is None:
+                baseline = state
+                continue
+            self.assertEqual( state, baseline, f"Load {load}" )
+
+        canvas = self.iface.mapCanvas()
+        self.assertEqual( canvas.totalInstalled, canvas.totalRemoved )
+
+
+if __name__ == '__main__':
+    unittest.main()
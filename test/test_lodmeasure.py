@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test Level of detail measure
+Description          : Moves of vertices are identical to a new build
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import sys, types, math, random, importlib, unittest
+
+from fractions import Fraction
+
+from .utilities import HAS_QGIS
+
+
+def importLodMeasure():
+    """
+    Without QGIS, only the names used by lodmeasure are stubbed while importing
+    """
+    if HAS_QGIS:
+        return importlib.import_module( '..lodmeasure', __package__ )
+
+    class QgsTask():
+        CanCancel = 0
+
+    names = ( 'qgis', 'qgis.PyQt', 'qgis.PyQt.QtCore', 'qgis.core' )
+    modules = { name: types.ModuleType( name ) for name in names }
+    modules['qgis.PyQt.QtCore'].pyqtSignal = lambda *args: None
+    modules['qgis.core'].QgsTask = QgsTask
+    modules['qgis.core'].QgsCoordinateTransform = object
+    moduleName = f"{__package__.rsplit( '.', 1 )[0]}.lodmeasure"
+    saved = { name: sys.modules.get( name ) for name in names + ( moduleName, ) }
+    sys.modules.update( modules )
+    try:
+        return importlib.import_module( moduleName )
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop( name, None )
+            else:
+                sys.modules[ name ] = module
+
+
+lodmeasure = importLodMeasure()
+
+
+class Point():
+    def __init__(self, x, y):
+        self._x, self._y = x, y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+class Line():
+    def __init__(self, ring):
+        self.ring = ring
+
+    def xVector(self):
+        return [ x for x, _y in self.ring ]
+
+    def yVector(self):
+        return [ y for _x, y in self.ring ]
+
+
+class Polygon():
+    """
+    Members of QgsGeometry and QgsPolygon used by LodMeasure
+    """
+    def __init__(self, rings):
+        self.rings = rings # [ [ ( x, y ) ] ], closed
+
+    def isMultipart(self):
+        return False
+
+    def asPolygon(self):
+        return [ [ Point( x, y ) for x, y in ring ] for ring in self.rings ]
+
+    def constGet(self):
+        return self
+
+    def nCoordinates(self):
+        return sum( len( ring ) for ring in self.rings )
+
+    def exteriorRing(self):
+        return Line( self.rings[0] )
+
+    def numInteriorRings(self):
+        return len( self.rings ) - 1
+
+    def interiorRing(self, id):
+        return Line( self.rings[ id + 1 ] )
+
+
+class TestLodMeasure(unittest.TestCase):
+    RINGS = 300
+    MOVES = 20 # By ring
+
+    def _ring(self, rnd):
+        total = rnd.randint( 3, 40 )
+        scale = 10 ** rnd.randint( -3, 7 )
+        ring = [ ( rnd.uniform( -scale, scale ), rnd.uniform( -scale, scale ) ) for _id in range( total ) ]
+        ring.append( ring[0] )
+        return ring
+
+    def _build(self, rings):
+        lod = lodmeasure.LodMeasure( 'layer', 1, None )
+        lod.setSource( Polygon( rings ) )
+        self.assertTrue( lod.build( Polygon( rings ) ) )
+        return lod
+
+    def _reference(self, rings):
+        # Exact by fractions
+        area, length = Fraction(0), Fraction(0)
+        for id, ring in enumerate( rings ):
+            cross = Fraction(0)
+            for ( x1, y1 ), ( x2, y2 ) in zip( ring, ring[1:] ):
+                cross += Fraction( x1 ) * Fraction( y2 ) - Fraction( x2 ) * Fraction( y1 )
+                length += Fraction( math.hypot( x2 - x1, y2 - y1 ) )
+            area += abs( cross ) if id == 0 else -abs( cross )
+        return float( area / 2 ), float( length )
+
+    def test_moves(self):
+        rnd = random.Random( 20261019 )
+        for id in range( self.RINGS ):
+            rings = [ self._ring( rnd ) ]
+            if id % 3 == 0: # Hole
+                rings.append( self._ring( rnd ) )
+            lod = self._build( rings )
+            for _move in range( self.MOVES ):
+                ring = rnd.randrange( len( rings ) )
+                points = rings[ ring ]
+                vertex = rnd.randrange( len( points ) )
+                x, y = points[ rnd.randrange( len( points ) ) ]
+                x, y = x + rnd.uniform( -1, 1 ) * abs( x ), y + rnd.uniform( -1, 1 ) * abs( y )
+                ids = ( 0, len( points ) - 1 ) if vertex in ( 0, len( points ) - 1 ) else ( vertex, )
+                for idPoint in ids:
+                    points[ idPoint ] = ( x, y )
+                self.assertEqual( lod.changedVertex( Polygon( rings ) ), ( 0, ring, min( ids ), x, y ) )
+                self.assertTrue( lod.moveVertex( 0, ring, vertex, x, y, ( x, y ) ) )
+                self.assertIsNone( lod.changedVertex( Polygon( rings ) ) ) # Source updated
+
+                built = self._build( rings )
+                message = f"Ring {id}, move {_move}"
+                self.assertEqual( ( lod.area(), lod.length() ), ( built.area(), built.length() ), message )
+                self.assertEqual( ( lod.area(), lod.length() ), self._reference( rings ), message )
+
+    def test_changed_vertex(self):
+        square = [ ( 0.0, 0.0 ), ( 1.0, 0.0 ), ( 1.0, 1.0 ), ( 0.0, 1.0 ), ( 0.0, 0.0 ) ]
+        lod = self._build( [ square ] )
+        self.assertIsNone( lod.changedVertex( Polygon( [ square ] ) ) )
+        moved = list( square )
+        moved[2] = ( 2.0, 2.0 )
+        self.assertEqual( lod.changedVertex( Polygon( [ moved ] ) ), ( 0, 0, 2, 2.0, 2.0 ) )
+        moved[0] = moved[4] = ( -1.0, 0.0 ) # Second vertex
+        self.assertIsNone( lod.changedVertex( Polygon( [ moved ] ) ) )
+        moved = [ square[0], ( 1.0, 0.0 ), ( 1.0, 1.0 ), ( 0.0, 1.0 ), ( 0.5, 0.5 ), square[0] ] # Added
+        self.assertIsNone( lod.changedVertex( Polygon( [ moved ] ) ) )
+        self.assertIsNone( lod.changedVertex( Polygon( [ square, square ] ) ) ) # Added ring
+        self.assertFalse( lod.moveVertex( 0, 0, 5, 0.0, 0.0 ) )
+        self.assertFalse( lod.moveVertex( 0, 1, 0, 0.0, 0.0 ) )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test Measure Cache
+Description          : Count of rows, eviction and lookups of MeasureCache
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import os, tempfile, unittest
+
+from ..measurecache import MeasureCache
+
+
+class Crs():
+    # Only authid is used by MeasureCache
+    def authid(self):
+        return 'EPSG:3857'
+
+
+class TestMeasureCache(unittest.TestCase):
+    def setUp(self):
+        self.dirpath = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join( self.dirpath.name, 'measures.sqlite' )
+        self.crs_unit = { 'crs': Crs(), 'area': 1, 'length': 0, 'auto': False }
+
+    def tearDown(self):
+        self.dirpath.cleanup()
+
+    def _count(self, cache):
+        return cache.conn.execute('SELECT COUNT(*) FROM measure').fetchone()[0]
+
+    def test_replace_not_counted(self):
+        cache = MeasureCache( self.filepath, maxRows=50 )
+        for fid in range( 48 ):
+            cache.put( 'layer', fid, b'digest', self.crs_unit, 1.0, 2.0 )
+        for _ in range( 30 ):
+            cache.put( 'layer', 0, b'digest', self.crs_unit, 1.0, 2.0 )
+        self.assertEqual( cache.rows, 48 )
+        self.assertEqual( self._count( cache ), 48 )
+        cache.close()
+
+    def test_get_is_lookup(self):
+        cache = MeasureCache( self.filepath, commitEvery=1000 )
+        cache.put( 'layer', 1, b'digest', self.crs_unit, 1.0, 2.0 )
+        changes = cache.conn.total_changes
+        for _ in range( 100 ):
+            self.assertEqual( cache.get( 'layer', 1, b'digest', self.crs_unit ), ( 1.0, 2.0 ) )
+        self.assertIsNone( cache.get( 'layer', 2, b'digest', self.crs_unit ) )
+        self.assertEqual( cache.conn.total_changes, changes )
+        cache.close()
+
+    def test_evict_least_used(self):
+        cache = MeasureCache( self.filepath, maxRows=20, commitEvery=1000 )
+        for fid in range( 20 ):
+            cache.put( 'layer', fid, b'digest', self.crs_unit, float( fid ), 0.0 )
+        cache.get( 'layer', 0, b'digest', self.crs_unit ) # Used after others, in memory
+        cache.put( 'layer', 20, b'digest', self.crs_unit, 20.0, 0.0 )
+        self.assertEqual( cache.rows, self._count( cache ) )
+        self.assertLessEqual( cache.rows, 20 )
+        self.assertIsNotNone( cache.get( 'layer', 0, b'digest', self.crs_unit ) )
+        self.assertIsNone( cache.get( 'layer', 1, b'digest', self.crs_unit ) )
+        cache.close()
+
+    def test_source_not_stored(self):
+        source = MeasureCache.layerSource( 'postgres', "dbname='gis' host=db user='admin'" )
+        self.assertEqual( source, MeasureCache.layerSource( 'postgres', "dbname='gis' host=db user='admin'" ) )
+        self.assertNotIn( 'admin', source )
+        self.assertNotIn( ':', source )
+        # Rows with plain sources are removed
+        cache = MeasureCache( self.filepath )
+        cache.put( "postgres:dbname='gis' password='secret'", 1, b'digest', self.crs_unit, 1.0, 2.0 )
+        cache.put( source, 1, b'digest', self.crs_unit, 1.0, 2.0 )
+        cache.close()
+        cache = MeasureCache( self.filepath )
+        self.assertEqual( cache.rows, 1 )
+        self.assertIsNotNone( cache.get( source, 1, b'digest', self.crs_unit ) )
+        cache.close()
+        with open( self.filepath, 'rb' ) as f:
+            self.assertNotIn( b'secret', f.read() )
+
+    def test_invalidate_and_reopen(self):
+        cache = MeasureCache( self.filepath )
+        for fid in range( 10 ):
+            cache.put( 'layer', fid, b'digest', self.crs_unit, 1.0, 2.0 )
+        cache.get( 'layer', 3, b'digest', self.crs_unit )
+        cache.invalidate( 'layer', 3 )
+        self.assertEqual( cache.rows, 9 )
+        cache.close()
+        cache = MeasureCache( self.filepath )
+        self.assertEqual( cache.rows, 9 )
+        self.assertIsNone( cache.get( 'layer', 3, b'digest', self.crs_unit ) )
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
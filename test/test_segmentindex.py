@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test Segment Index
+Description          : SegmentGrid against brute force
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import random, unittest
+
+from ..segmentindex import SegmentGrid, segmentsIntersect
+
+
+class TestSegmentsIntersect(unittest.TestCase):
+    def test_crossing(self):
+        self.assertTrue( segmentsIntersect( 0, 0, 2, 2, 0, 2, 2, 0 ) )
+        self.assertFalse( segmentsIntersect( 0, 0, 1, 1, 2, 2, 3, 0 ) )
+
+    def test_touch(self):
+        # Not consecutive in ring: touch is intersection
+        self.assertTrue( segmentsIntersect( 0, 0, 2, 0, 1, 0, 1, 1 ) )
+        self.assertTrue( segmentsIntersect( 0, 0, 1, 1, 1, 1, 2, 0 ) )
+
+    def test_adjacent(self):
+        self.assertFalse( segmentsIntersect( 0, 0, 1, 1, 1, 1, 2, 0, True ) )
+        self.assertFalse( segmentsIntersect( 0, 0, 1, 0, 1, 0, 2, 0, True ) ) # Collinear, forward
+        self.assertTrue( segmentsIntersect( 0, 0, 2, 0, 2, 0, 1, 0, True ) ) # Back-tracking spike
+        self.assertTrue( segmentsIntersect( 0, 0, 2, 0, 2, 0, -1, 0, True ) )
+
+
+class TestSegmentGrid(unittest.TestCase):
+    def _bruteForce(self, segments, x1, y1, x2, y2, adjacentIds):
+        return any(
+            segmentsIntersect( x1, y1, x2, y2, *q, id in adjacentIds )
+            for id, q in segments.items()
+        )
+
+    def _check(self, rnd, lengths, total=300):
+        grid, segments = SegmentGrid(), {}
+        for id in range( total ):
+            x, y = rnd.uniform( -100, 100 ), rnd.uniform( -100, 100 )
+            length = lengths( id )
+            q = ( x, y, x + rnd.uniform( -length, length ), y + rnd.uniform( -length, length ) )
+            grid.add( id, *q )
+            segments[ id ] = q
+            if rnd.random() < 0.1:
+                removed = rnd.choice( list( segments ) )
+                grid.remove( removed )
+                del segments[ removed ]
+            for _ in range( 5 ):
+                x, y = rnd.uniform( -120, 120 ), rnd.uniform( -120, 120 )
+                length = rnd.choice( ( 1, 20, 300 ) )
+                p = ( x, y, x + rnd.uniform( -length, length ), y + rnd.uniform( -length, length ) )
+                adjacentIds = ( id, )
+                self.assertEqual( grid.intersects( *p, adjacentIds ), self._bruteForce( segments, *p, adjacentIds ) )
+        return grid
+
+    def test_random(self):
+        rnd = random.Random(1)
+        self._check( rnd, lambda id: rnd.choice( ( 0.5, 5, 50 ) ) )
+
+    def test_growing_edges(self):
+        # First edge short, next edges 20x longer: cells follow the mean
+        rnd = random.Random(2)
+        grid = self._check( rnd, lambda id: 1 if id == 0 else 20 )
+        self.assertFalse( grid.large )
+        self.assertGreater( grid.cellSize, 5 )
+
+    def test_shrinking_edges(self):
+        rnd = random.Random(3)
+        grid = self._check( rnd, lambda id: 100 if id < 3 else 0.5 )
+        self.assertLess( grid.cellSize, 5 )
+
+    def test_vertices_on_cell_borders(self):
+        grid, segments = SegmentGrid(), {}
+        for id in range( 50 ):
+            q = ( float( id ), 0.0, float( id ), 1.0 )
+            grid.add( id, *q )
+            segments[ id ] = q
+        for y in ( 0.0, 0.5, 1.0, 1.5 ):
+            p = ( -0.5, y, 49.5, y )
+            self.assertEqual( grid.intersects( *p ), self._bruteForce( segments, *p, () ) )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test Session Recorder
+Description          : Read of truncated and corrupted sessions
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import os, tempfile, unittest
+
+from .utilities import HAS_QGIS, getQgisApp
+
+if HAS_QGIS:
+    from .qgis_interface import QgisInterface
+    from ..sessionrecorder import (
+        SessionRecorder, readSession,
+        MAGIC, VERSION, HEADER, RECORD, DATA, SEPARATOR,
+        CONTEXT, MOUSE_MOVE, KEY_RELEASE
+    )
+
+
+@unittest.skipUnless( HAS_QGIS, 'QGIS not available' )
+class TestReadSession(unittest.TestCase):
+    def setUp(self):
+        text = f"mActionAddFeature{SEPARATOR}EPSG:4326".encode('utf-8')
+        self.records = [
+            RECORD.pack( CONTEXT, 0 ) + DATA[ CONTEXT ].pack( 0, 0, 10, 10, len( text ) ) + text,
+            RECORD.pack( MOUSE_MOVE, 10 ) + DATA[ MOUSE_MOVE ].pack( 1.0, 2.0, 0, 0, 0 ),
+            RECORD.pack( KEY_RELEASE, 20 ) + DATA[ KEY_RELEASE ].pack( 0x01000000, 0 )
+        ]
+        self.content = HEADER.pack( MAGIC, VERSION ) + b''.join( self.records )
+        fd, self.filepath = tempfile.mkstemp( suffix='.ca2r' )
+        os.close( fd )
+
+    def tearDown(self):
+        os.remove( self.filepath )
+
+    def _read(self, content):
+        with open( self.filepath, 'wb' ) as writer:
+            writer.write( content )
+        return readSession( self.filepath )
+
+    def test_complete(self):
+        records, isTruncated = self._read( self.content )
+        self.assertEqual( len( records ), 3 )
+        self.assertFalse( isTruncated )
+        self.assertEqual( records[0][2][1:], ( 'mActionAddFeature', 'EPSG:4326' ) )
+
+    def test_truncated(self):
+        # Each size of file: complete records before the cut
+        ends = []
+        offset = HEADER.size
+        for record in self.records:
+            offset += len( record )
+            ends.append( offset )
+        for size in range( HEADER.size, len( self.content ) ):
+            records, isTruncated = self._read( self.content[ :size ] )
+            self.assertEqual( len( records ), sum( 1 for end in ends if end <= size ) )
+            self.assertEqual( isTruncated, not size in ends and size > HEADER.size )
+
+    def test_invalid(self):
+        for content in (
+            b'',
+            b'CA2',
+            b'XXXX' + self.content[4:],
+            self.content + RECORD.pack( 99, 0 )
+        ):
+            with self.assertRaises( TypeError ):
+                self._read( content )
+
+
+@unittest.skipUnless( HAS_QGIS, 'QGIS not available' )
+class TestSessionRecorder(unittest.TestCase):
+    def test_start_not_writable(self):
+        getQgisApp()
+        iface = QgisInterface()
+        recorder = SessionRecorder( iface )
+        with tempfile.TemporaryDirectory() as dirpath:
+            with self.assertRaises( OSError ):
+                recorder.start( os.path.join( dirpath, 'missing', 'session.ca2r' ) )
+        self.assertFalse( recorder.isRecording() )
+        self.assertFalse( iface.mapCanvas().filters )
+
+
+if __name__ == '__main__':
+    unittest.main()
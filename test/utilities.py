@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+Name                 : Test utilities
+Description          : QGIS application for tests and benchmarks
+Date                 : October, 2026
+copyright            : (C) 2026 by Luiz Motta
+email                : motta.luiz@gmail.com
+
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+__author__ = 'Luiz Motta'
+__date__ = '2026-10-19'
+__copyright__ = '(C) 2026, Luiz Motta'
+__revision__ = '$Format:%H$'
+
+
+import os, importlib.util
+
+HAS_QGIS = not importlib.util.find_spec('qgis') is None
+
+QGIS_APP = None
+
+
+def getQgisApp():
+    """
+    Start QgsApplication once, offscreen when not running inside QGIS
+    """
+    global QGIS_APP
+    from qgis.core import QgsApplication
+
+    if not QGIS_APP is None:
+        return QGIS_APP
+
+    QGIS_APP = QgsApplication.instance()
+    if QGIS_APP is None:
+        os.environ.setdefault( 'QT_QPA_PLATFORM', 'offscreen' )
+        QGIS_APP = QgsApplication( [], True )
+        QGIS_APP.initQgis()
+    return QGIS_APP